@@ -1,10 +1,22 @@
 from .queries import Query
-from .resolver import get_resource_by_name, get_resource_map
+from .resolver import (
+    CyclePolicy,
+    aget_resource_map,
+    cache_clear,
+    cache_info,
+    get_resource_by_name,
+    get_resource_map,
+    invalidate,
+    refresh,
+    warm,
+    warm_in_background,
+)
 from .types import (
     BaseFieldValidation,
     DecimalFieldValidation,
     Field,
     FieldChoice,
+    FieldChoicePage,
     FieldKind,
     FieldObject,
     FieldObjectKind,
@@ -24,10 +36,12 @@ from .types import (
 
 __all__ = [
     "BaseFieldValidation",
+    "CyclePolicy",
     "DecimalFieldValidation",
     "DecimalFieldValidation",
     "Field",
     "FieldChoice",
+    "FieldChoicePage",
     "FieldKind",
     "FieldObject",
     "FieldObjectKind",
@@ -49,7 +63,14 @@ __all__ = [
     "Query",
     "Resource",
     "StringFieldValidation",
+    "aget_resource_map",
+    "cache_clear",
+    "cache_info",
     "config",
     "get_resource_by_name",
     "get_resource_map",
+    "invalidate",
+    "refresh",
+    "warm",
+    "warm_in_background",
 ]
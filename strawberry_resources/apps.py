@@ -0,0 +1,43 @@
+from typing import List
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from .resolver import warm, warm_in_background
+
+WARM_UP_BACKGROUND = "background"
+WARM_UP_BLOCKING = "blocking"
+
+
+def warm_up_schemas():
+    """Warm up the schemas configured in the settings.
+
+    `STRAWBERRY_RESOURCES_SCHEMAS` is a list of dotted paths to the schemas to
+    warm up, and `STRAWBERRY_RESOURCES_WARM_UP` either `"background"` (the
+    default) to resolve them in a thread, or `"blocking"` to resolve them right
+    away.
+    """
+    schemas: List[str] = getattr(settings, "STRAWBERRY_RESOURCES_SCHEMAS", [])
+    mode = getattr(settings, "STRAWBERRY_RESOURCES_WARM_UP", WARM_UP_BACKGROUND)
+    if mode not in {WARM_UP_BACKGROUND, WARM_UP_BLOCKING}:
+        raise ImproperlyConfigured(
+            f"Invalid STRAWBERRY_RESOURCES_WARM_UP {mode!r}, expected "
+            f"{WARM_UP_BACKGROUND!r} or {WARM_UP_BLOCKING!r}",
+        )
+
+    for path in schemas:
+        schema = import_string(path)
+        if mode == WARM_UP_BLOCKING:
+            warm(schema)
+        else:
+            warm_in_background(schema)
+
+
+class StrawberryResourcesConfig(AppConfig):
+    name = "strawberry_resources"
+    verbose_name = "Strawberry Resources"
+
+    def ready(self):
+        warm_up_schemas()
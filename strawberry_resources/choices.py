@@ -0,0 +1,83 @@
+"""Paginated access to the choices of a field.
+
+Fields with lots of choices (e.g. countries or currencies) make up most of the
+resources' payload when those get embedded. Their choices can instead be
+retrieved in pages, searching them by the prefix of their labels.
+"""
+
+import bisect
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .types import FieldChoice
+
+try:
+    from django.core.exceptions import ImproperlyConfigured
+    from django.utils.translation import get_language
+except ImportError:  # pragma:nocover
+    get_language = None
+
+# Keyed by the choices id and the active language, since lazy labels differ
+# once translated. The list is kept alive to make sure its id is not reused
+_indexes: Dict[Tuple[int, Optional[str]], "ChoicesIndex"] = {}
+
+
+def _normalize(label: object) -> str:
+    return str(label).casefold()
+
+
+def _get_language() -> Optional[str]:
+    if get_language is None:  # pragma:nocover
+        return None
+
+    try:
+        return get_language()
+    except ImproperlyConfigured:  # pragma:nocover
+        return None
+
+
+class ChoicesIndex:
+    """The choices of a field, sorted by their normalized labels."""
+
+    def __init__(self, choices: Sequence[FieldChoice]):
+        self.choices = choices
+        entries = sorted((_normalize(c.label), i) for i, c in enumerate(choices))
+        self._labels = [label for label, _ in entries]
+        self._positions = [i for _, i in entries]
+
+    def search(self, prefix: str) -> List[FieldChoice]:
+        """Return the choices whose label starts with the prefix, case insensitive.
+
+        The matches keep the order in which the choices were defined.
+        """
+        prefix = _normalize(prefix)
+        start = bisect.bisect_left(self._labels, prefix)
+        # No label starting with the prefix can sort after it followed by the
+        # greatest code point
+        end = bisect.bisect_right(self._labels, prefix + "\U0010ffff", lo=start)
+        return [self.choices[i] for i in sorted(self._positions[start:end])]
+
+
+def get_choices_index(choices: Sequence[FieldChoice]) -> ChoicesIndex:
+    """Return the index for the choices, building it on the first call."""
+    key = (id(choices), _get_language())
+    if (index := _indexes.get(key)) is None or index.choices is not choices:
+        index = _indexes[key] = ChoicesIndex(choices)
+
+    return index
+
+
+def get_choices_page(
+    choices: Sequence[FieldChoice],
+    *,
+    search: Optional[str] = None,
+    offset: int = 0,
+    limit: int,
+) -> Tuple[List[FieldChoice], int]:
+    """Return a page of the choices, with the total number of matching ones."""
+    matches = get_choices_index(choices).search(search) if search else choices
+    offset = max(offset, 0)
+    return list(matches[offset : offset + max(limit, 0)]), len(matches)
+
+
+def clear_indexes():
+    _indexes.clear()
@@ -1,6 +1,7 @@
 import click
 
 from .export import export
+from .snapshot import snapshot
 
 
 @click.group()
@@ -9,3 +10,4 @@ def run():  # pragma: nocover
 
 
 run.add_command(export)
+run.add_command(snapshot)
@@ -1,9 +1,13 @@
+import contextlib
 import sys
+from typing import Optional, cast
 
 import click
 from strawberry.cli.utils import load_schema
 
 from strawberry_resources.exporter import to_json
+from strawberry_resources.profiling import profile as profile_resolution
+from strawberry_resources.resolver import DEFAULT_MAX_DEPTH, CyclePolicy
 
 
 @click.command(short_help="Exports the resources")
@@ -33,19 +37,65 @@ from strawberry_resources.exporter import to_json
     default=False,
     help="Remove nested types fields to keep the output size smaller",
 )
+@click.option(
+    "--max-depth",
+    type=int,
+    show_default=True,
+    default=DEFAULT_MAX_DEPTH,
+    help="How deep nested types should be expanded",
+)
+@click.option(
+    "--cycle-policy",
+    type=click.Choice([p.value for p in CyclePolicy]),
+    show_default=True,
+    default=CyclePolicy.EXPAND.value,
+    help=(
+        "How to handle types nested inside themselves. `stop` will not expand "
+        "types already expanded in the current path, keeping the output smaller"
+    ),
+)
+@click.option(
+    "--choices-by-reference",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help=(
+        "Export a key instead of the choices of the fields, which can be passed "
+        "to the `resourceChoices` query to retrieve them in pages"
+    ),
+)
+@click.option(
+    "--profile",
+    type=int,
+    default=None,
+    metavar="N",
+    help="Print the N entries which took the most time to resolve to stderr",
+)
 def export(
     schema: str,
     app_dir: str,
     remove_nulls: bool,
     remove_nested_types_fields: bool,
+    max_depth: int,
+    cycle_policy: str,
+    choices_by_reference: bool,
+    profile: Optional[int],
 ):
     schema_obj = load_schema(schema, app_dir)
-    sys.stdout.write(
-        to_json(
+    with (
+        profile_resolution() if profile is not None else contextlib.nullcontext()
+    ) as resolution_profile:
+        data = to_json(
             schema_obj,
             remove_nulls=remove_nulls,
             remove_nested_types_fields=remove_nested_types_fields,
+            max_depth=max_depth,
+            cycle_policy=CyclePolicy(cycle_policy),
+            choices_by_reference=choices_by_reference,
             indent=2,
             ensure_ascii=False,
-        ),
-    )
+        )
+
+    sys.stdout.write(data)
+    if resolution_profile is not None:
+        click.echo(resolution_profile.format(cast(int, profile)), err=True)
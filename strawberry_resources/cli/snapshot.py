@@ -0,0 +1,41 @@
+import pathlib
+import sys
+from typing import Optional
+
+import click
+from strawberry.cli.utils import load_schema
+
+from strawberry_resources.snapshot import generate_snapshot
+
+
+@click.command(short_help="Generates a python module snapshot of the resources")
+@click.argument("schema", type=str)
+@click.option(
+    "--app-dir",
+    default=".",
+    type=str,
+    show_default=True,
+    help=(
+        "Look for the module in the specified directory, by adding this to the "
+        "PYTHONPATH. Defaults to the current working directory. "
+        "Works the same as `--app-dir` in uvicorn."
+    ),
+)
+@click.option(
+    "-o",
+    "--output",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the snapshot to the given file instead of the stdout",
+)
+def snapshot(
+    schema: str,
+    app_dir: str,
+    output: Optional[str],
+):
+    schema_obj = load_schema(schema, app_dir)
+    source = generate_snapshot(schema_obj)
+    if output is None:
+        sys.stdout.write(source)
+    else:
+        pathlib.Path(output).write_text(source, encoding="utf-8")
@@ -0,0 +1,191 @@
+"""Compact representation of the resolved resources.
+
+Resolved resources are kept in memory (and in storages/snapshots) as named
+tuples, which are a lot smaller than the strawberry types. They only get
+converted to `Resource`, `Field` and `FieldObject` when returned to the user,
+e.g. at the query boundary.
+"""
+
+import dataclasses
+import weakref
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .types import (
+    BaseFieldValidation,
+    Field,
+    FieldChoice,
+    FieldKind,
+    FieldObject,
+    FieldObjectKind,
+    Resource,
+    ResourceField,
+)
+
+# Validation objects are shared by all fields with the same validation
+_validations: Dict[Tuple[Any, ...], BaseFieldValidation] = {}
+
+
+class FieldData(NamedTuple):
+    name: str
+    kind: FieldKind
+    label: str
+    multiple: bool = False
+    orderable: bool = False
+    filterable: bool = False
+    help_text: Optional[str] = None
+    # Interned, so shared by all the fields with the same choices
+    choices: Optional[Tuple[FieldChoice, ...]] = None
+    default_value: Any = None
+    validation: Optional[BaseFieldValidation] = None
+    resource: Optional[str] = None
+    choices_key: Optional[str] = None
+
+
+class FieldObjectData(NamedTuple):
+    name: str
+    label: str
+    obj_kind: FieldObjectKind
+    obj_type: str
+    fields: List["FieldOrFieldObjectData"]
+    resource: Optional[str] = None
+
+
+class ResourceData(NamedTuple):
+    name: str
+    fields: List["FieldOrFieldObjectData"]
+    orderable_fields: Tuple[str, ...] = ()
+    filterable_fields: Tuple[str, ...] = ()
+
+
+FieldOrFieldObjectData = Union[FieldData, FieldObjectData]
+
+
+def intern_validation(validation: BaseFieldValidation) -> BaseFieldValidation:
+    """Return a shared validation object equal to the given one.
+
+    The returned object is shared between fields, so it should not be modified
+    in place.
+    """
+    key = (
+        type(validation),
+        *(getattr(validation, f.name) for f in dataclasses.fields(validation)),
+    )
+    try:
+        return _validations.setdefault(key, validation)
+    except TypeError:
+        # Unhashable values, do not intern those
+        return validation
+
+
+class _FieldList(List[ResourceField]):
+    """A list of converted fields, which can be weakly referenced."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _ResourceMap(Dict[str, Resource]):
+    """A map of converted resources, which can be weakly referenced."""
+
+    __slots__ = ("__weakref__",)
+
+
+class Materializer:
+    """Convert compact resources into their strawberry types.
+
+    Converted objects are only weakly cached: converting the same data again
+    returns the same objects while those are still alive, and shared fields
+    lists keep being shared, but the converted objects do not stay in memory
+    after being used.
+    """
+
+    def __init__(self):
+        # Keyed by the data id, the data is kept alive to make sure its id is
+        # not reused while the converted object is alive
+        self._objects: Dict[int, Tuple[Any, weakref.ref[Any]]] = {}
+
+    def _get(self, data: Any) -> Any:
+        if (entry := self._objects.get(id(data))) is not None and entry[0] is data:
+            return entry[1]()
+
+        return None
+
+    def _set(self, data: Any, obj: Any):
+        key = id(data)
+
+        def _remove(ref: "weakref.ref[Any]"):
+            if (entry := self._objects.get(key)) is not None and entry[1] is ref:
+                del self._objects[key]
+
+        self._objects[key] = (data, weakref.ref(obj, _remove))
+
+    def resource_map(self, data: Dict[str, ResourceData]) -> Dict[str, Resource]:
+        if (resource_map := self._get(data)) is None:
+            resource_map = _ResourceMap(
+                (name, self.resource(resource)) for name, resource in data.items()
+            )
+            self._set(data, resource_map)
+
+        return resource_map
+
+    def resource(self, data: ResourceData) -> Resource:
+        if (resource := self._get(data)) is None:
+            resource = Resource(
+                name=data.name,
+                fields=self.fields(data.fields),
+                orderable_fields=list(data.orderable_fields),
+                filterable_fields=list(data.filterable_fields),
+            )
+            self._set(data, resource)
+
+        return resource
+
+    def fields(self, data: List[FieldOrFieldObjectData]) -> List[ResourceField]:
+        pending: List[Tuple[List[FieldOrFieldObjectData], List[ResourceField]]] = []
+        fields = self._get_fields_placeholder(data, pending)
+
+        # Use a work stack instead of recursing into nested fields, so that
+        # deep max_depth values are not limited by the recursion limit
+        while pending:
+            pending_data, pending_fields = pending.pop()
+            pending_fields.extend(self._field(f, pending) for f in pending_data)
+
+        return fields
+
+    def _get_fields_placeholder(
+        self,
+        data: List[FieldOrFieldObjectData],
+        pending: List[Tuple[List[FieldOrFieldObjectData], List[ResourceField]]],
+    ) -> List[ResourceField]:
+        if (fields := self._get(data)) is None:
+            # The list will be filled when the pending lists get converted
+            fields = _FieldList()
+            self._set(data, fields)
+            pending.append((data, fields))
+
+        return fields
+
+    def _field(
+        self,
+        data: FieldOrFieldObjectData,
+        pending: List[Tuple[List[FieldOrFieldObjectData], List[ResourceField]]],
+    ) -> ResourceField:
+        if isinstance(data, FieldObjectData):
+            return FieldObject(
+                name=data.name,
+                label=data.label,
+                obj_kind=data.obj_kind,
+                obj_type=data.obj_type,
+                fields=self._get_fields_placeholder(data.fields, pending),
+                resource=data.resource,
+            )
+
+        options = data._asdict()
+        if options["validation"] is None:
+            del options["validation"]
+        # The interned choices are shared, give each field its own list
+        if options["choices"] is not None:
+            options["choices"] = list(options["choices"])
+        return Field(**options)
+
+    def clear(self):
+        self._objects.clear()
@@ -2,67 +2,122 @@ import dataclasses
 import decimal
 import enum
 import json
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import strawberry
 from strawberry.utils.str_converters import to_camel_case
 
-from .resolver import get_resource_map
+from .compact import FieldData, FieldObjectData, ResourceData
+from .resolver import (
+    DEFAULT_MAX_DEPTH,
+    CyclePolicy,
+    _get_compact_map,
+    _ResolveOptions,
+)
 
 try:
     from django.utils.functional import Promise
 except ImportError:
     Promise = None
 
+# Those are only exported when set, to keep the output small
+_OMITTED_WHEN_FALSY = {
+    "multiple",
+    "filterable",
+    "orderable",
+    "orderable_fields",
+    "filterable_fields",
+}
+
+
+# Containers being filled, with the index (or key) to set and the data to fix
+_Pending = List[Tuple[Union[Dict[str, Any], List[Any]], Any, Any, Optional[str]]]
+
 
 def _fix_data(
     data: Any,
     *,
-    key: Optional[str] = None,
     remove_nulls: bool,
     remove_fields_from_types: List[str],
+    choices_by_reference: bool,
 ):
+    root: List[Any] = [None]
+    pending: _Pending = [(root, 0, data, None)]
+
+    # Use a work stack instead of recursing into nested fields, so that deep
+    # max_depth values are not limited by the recursion limit
+    while pending:
+        container, index, value, key = pending.pop()
+        container[index] = _fix_value(
+            value,
+            pending,
+            key=key,
+            remove_nulls=remove_nulls,
+            remove_fields_from_types=remove_fields_from_types,
+            choices_by_reference=choices_by_reference,
+        )
+
+    return root[0]
+
+
+def _fix_value(
+    data: Any,
+    pending: _Pending,
+    *,
+    key: Optional[str],
+    remove_nulls: bool,
+    remove_fields_from_types: List[str],
+    choices_by_reference: bool,
+):
+    """Fix the given value, adding its items to `pending` to be fixed later.
+
+    Containers are returned with their keys already set, in the same order as
+    the original ones, and get filled as the pending items get fixed.
+    """
+    if isinstance(data, FieldData):
+        data = data._asdict()
+        # Either embed the choices or reference them, not both
+        if choices_by_reference and data["choices_key"] is not None:
+            del data["choices"]
+        else:
+            del data["choices_key"]
+    elif isinstance(data, (FieldObjectData, ResourceData)):
+        data = data._asdict()
+    elif dataclasses.is_dataclass(data) and not isinstance(data, type):
+        # Validations and choices
+        data = {f.name: getattr(data, f.name) for f in dataclasses.fields(data)}
+
+    items: List[Tuple[Any, Any, Optional[str]]]
     if isinstance(data, dict):
-        data = {
-            to_camel_case(k): _fix_data(
-                v,
-                key=k,
-                remove_nulls=remove_nulls,
-                remove_fields_from_types=remove_fields_from_types,
-            )
+        fixed: Union[Dict[str, Any], List[Any]] = {}
+        remove_fields = (
+            "obj_kind" in data and data.get("obj_type") in remove_fields_from_types
+        )
+        items = [
+            (to_camel_case(k), v, k)
             for k, v in data.items()
             if (
                 (not remove_nulls or v is not None)
-                and not (k in {"multiple", "filterable", "orderable"} and not v)
+                and not (k in _OMITTED_WHEN_FALSY and not v)
+                and not (k == "fields" and remove_fields)
             )
-        }
-
-        if "objKind" in data and data.get("objType") in remove_fields_from_types:
-            data.pop("fields", None)
-
+        ]
+    elif isinstance(data, (list, tuple)):
+        if key == "fields":
+            fixed = {}
+            items = [(i.name, i, None) for i in data]
+        else:
+            fixed = [None] * len(data)
+            items = [(index, v, None) for index, v in enumerate(data)]
+    else:
         return data
-    if isinstance(data, (list, tuple)):
-        return (
-            {
-                i["name"]: _fix_data(
-                    i,
-                    remove_nulls=remove_nulls,
-                    remove_fields_from_types=remove_fields_from_types,
-                )
-                for i in data
-            }
-            if key == "fields"
-            else [
-                _fix_data(
-                    v,
-                    remove_nulls=remove_nulls,
-                    remove_fields_from_types=remove_fields_from_types,
-                )
-                for v in data
-            ]
-        )
 
-    return data
+    for index, _, _ in items:
+        fixed[index] = None
+
+    # Reversed, so that they get fixed in order
+    pending.extend((fixed, index, v, k) for index, v, k in reversed(items))
+    return fixed
 
 
 class _Encoder(json.JSONEncoder):
@@ -82,15 +137,21 @@ def to_dict(
     *,
     remove_nulls: bool = False,
     remove_nested_types_fields: bool = False,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+    choices_by_reference: bool = False,
 ):
-    resource_map = get_resource_map(schema)
-    data = {name: dataclasses.asdict(r) for name, r in resource_map.items()}
-    remove_types = list(data) if remove_nested_types_fields else []
+    # Read the compact resources directly, without converting them first
+    resource_map = _get_compact_map(schema, _ResolveOptions(max_depth, cycle_policy))
+    remove_types = list(resource_map) if remove_nested_types_fields else []
     return {
         k: _fix_data(
-            v, remove_nulls=remove_nulls, remove_fields_from_types=remove_types
+            v,
+            remove_nulls=remove_nulls,
+            remove_fields_from_types=remove_types,
+            choices_by_reference=choices_by_reference,
         )
-        for k, v in data.items()
+        for k, v in resource_map.items()
     }
 
 
@@ -99,11 +160,24 @@ def to_json(
     *,
     remove_nulls: bool = False,
     remove_nested_types_fields: bool = False,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+    choices_by_reference: bool = False,
     **kwargs,
 ):
     data = to_dict(
         schema,
         remove_nulls=remove_nulls,
         remove_nested_types_fields=remove_nested_types_fields,
+        max_depth=max_depth,
+        cycle_policy=cycle_policy,
+        choices_by_reference=choices_by_reference,
     )
-    return json.dumps(data, cls=_Encoder, **kwargs)
+    try:
+        return json.dumps(data, cls=_Encoder, **kwargs)
+    except RecursionError as e:
+        # The json encoder recurses into nested fields, unlike to_dict
+        raise ValueError(
+            f"The resources are nested too deep to be encoded (max_depth={max_depth}), "
+            "use to_dict or a lower max_depth instead",
+        ) from e
@@ -1,6 +1,8 @@
-from .base import StrawberryResourceIntegration, get_all
+from .base import StrawberryResourceIntegration, get_all, get_extra_mappings, register
 
 __all__ = [
     "StrawberryResourceIntegration",
     "get_all",
+    "get_extra_mappings",
+    "register",
 ]
@@ -1,7 +1,9 @@
 import contextlib
 import dataclasses
-import pathlib
-from typing import TYPE_CHECKING, Callable, Dict, List, Type
+import importlib
+import sys
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Type
 
 from strawberry.types.base import WithStrawberryObjectDefinition
 from strawberry.types.field import StrawberryField
@@ -9,8 +11,21 @@ from strawberry.types.field import StrawberryField
 if TYPE_CHECKING:
     from strawberry_resources.types import FieldKind, FieldOrFieldObjectOptions
 
-_integrations_imported: bool = False
+# Third party integrations can be registered by exposing either a module defining
+# them or the integration itself in this entry point group
+ENTRY_POINT_GROUP = "strawberry_resources.integrations"
+# Official integrations' modules, with the module they integrate with. Those are
+# only imported once the integrated module is, since no schema could be using it
+# before that
+builtin_integrations: Dict[str, str] = {
+    "strawberry_resources.integrations.django": "strawberry_django",
+}
+
+_integrations_loaded: bool = False
+_pending_builtin_integrations: List[str] = []
 integrations: Dict[str, "StrawberryResourceIntegration"] = {}
+_sorted_integrations: Optional[List["StrawberryResourceIntegration"]] = None
+_extra_mappings: Optional[Dict[type, "FieldKind"]] = None
 
 
 @dataclasses.dataclass
@@ -22,33 +37,104 @@ class StrawberryResourceIntegration:
         "FieldOrFieldObjectOptions",
     ]
     ordering: int = 0
+    get_type_fingerprint: Optional[
+        Callable[[Type[WithStrawberryObjectDefinition]], Optional[str]]
+    ] = None
+    # Whether the integration should run for the type's fields at all. It is
+    # evaluated once per type, `None` means it applies to all types
+    applies_to: Optional[Callable[[Type[WithStrawberryObjectDefinition]], bool]] = None
+    # Batched version of `get_field_options`, used instead of it when defined.
+    # It receives the type and all its fields, as `(field, resolved_type, is_list)`
+    # tuples, and returns their options in the same order, `None` hiding a field
+    get_fields_options: Optional[
+        Callable[
+            [
+                Type[WithStrawberryObjectDefinition],
+                List[Tuple[StrawberryField, type, bool]],
+            ],
+            List[Optional["FieldOrFieldObjectOptions"]],
+        ]
+    ] = None
+    # Clears whatever the integration caches, called by `resolver.cache_clear`
+    clear_cache: Optional[Callable[[], None]] = None
 
     def __post_init__(self):
-        integrations[self.name] = self
+        register(self)
+
+
+def register(integration: StrawberryResourceIntegration):
+    """Register the integration, replacing any other one with the same name.
+
+    Note that integrations get registered automatically when created.
+    """
+    global _sorted_integrations, _extra_mappings  # noqa: PLW0603
+
+    integrations[integration.name] = integration
+    _sorted_integrations = None
+    _extra_mappings = None
+
+
+def _iter_entry_points():
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return eps.select(group=ENTRY_POINT_GROUP)
+
+    # Python < 3.10
+    return eps.get(ENTRY_POINT_GROUP, [])  # type: ignore  # pragma:nocover
+
+
+def _load_builtin_integrations():
+    for module in list(_pending_builtin_integrations):
+        if builtin_integrations[module] not in sys.modules:
+            continue
+
+        _pending_builtin_integrations.remove(module)
+        # Other optional dependencies might not be installed
+        with contextlib.suppress(ImportError):
+            importlib.import_module(module)
+
+
+def _load_entry_points():
+    for entry_point in _iter_entry_points():
+        # Loading a module is enough for its integrations to register themselves
+        if isinstance(obj := entry_point.load(), StrawberryResourceIntegration):
+            register(obj)
 
 
 def get_all() -> List[StrawberryResourceIntegration]:
-    global _integrations_imported  # noqa: PLW0603
-
-    if not _integrations_imported:
-        for module in pathlib.Path(__file__).parent.iterdir():
-            if (
-                not module.is_file()
-                or module.name in {"__init__.py", "base.py"}
-                or not module.name.endswith(".py")
-            ):
-                continue
-
-            with contextlib.suppress(Exception):
-                mod = __import__(
-                    f"strawberry_resources.integrations.{module.name[:-3]}",
-                    locals(),
-                    globals(),
-                    fromlist=["integration"],
-                )
-                if not isinstance(mod.integration, StrawberryResourceIntegration):
-                    raise TypeError
-
-        _integrations_imported = True
-
-    return sorted(integrations.values(), key=lambda i: i.ordering)
+    """Return all registered integrations, sorted by their ordering.
+
+    The entry point integrations are loaded on the first call, and the official
+    ones once the module they integrate with gets imported. The returned list is
+    cached until a new integration gets registered, and should not be modified.
+    """
+    global _integrations_loaded, _sorted_integrations  # noqa: PLW0603
+
+    if not _integrations_loaded:
+        _integrations_loaded = True
+        _pending_builtin_integrations[:] = builtin_integrations
+        _load_entry_points()
+    if _pending_builtin_integrations:
+        _load_builtin_integrations()
+
+    if _sorted_integrations is None:
+        _sorted_integrations = sorted(integrations.values(), key=lambda i: i.ordering)
+
+    return _sorted_integrations
+
+
+def get_extra_mappings() -> Dict[type, "FieldKind"]:
+    """Return the type -> `FieldKind` mappings from all integrations merged together.
+
+    The result is computed once and cached until a new integration gets registered.
+    """
+    global _extra_mappings  # noqa: PLW0603
+
+    if _extra_mappings is None:
+        extra_mappings: Dict[type, FieldKind] = {}
+        for integration in get_all():
+            extra_mappings.update(integration.get_extra_mappings())
+
+        _extra_mappings = extra_mappings
+
+    return _extra_mappings
@@ -1,11 +1,17 @@
 import dataclasses
 import functools
+import hashlib
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
+    FrozenSet,
+    Iterable,
     List,
+    NamedTuple,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -14,11 +20,17 @@ from typing import (
 
 from django.core.exceptions import ImproperlyConfigured
 from django.db import models
-from django.db.models.fields import NOT_PROVIDED
-from strawberry import UNSET
+from django.db.models.fields import NOT_PROVIDED, AutoFieldMixin
+from django.db.models.signals import class_prepared
+from strawberry import UNSET, LazyType
 from strawberry.scalars import JSON
-from strawberry.types import has_object_definition
-from strawberry.types.base import StrawberryOptional, WithStrawberryObjectDefinition
+from strawberry.types import get_object_definition, has_object_definition
+from strawberry.types.base import (
+    StrawberryContainer,
+    StrawberryOptional,
+    WithStrawberryObjectDefinition,
+)
+from strawberry.types.enum import EnumDefinition
 from strawberry_django.fields.types import (
     DjangoFileType,
     DjangoImageType,
@@ -28,10 +40,15 @@ from strawberry_django.utils.typing import get_django_definition
 from typing_extensions import Annotated, get_args, get_origin
 
 from strawberry_resources.types import (
+    DecimalFieldValidation,
+    FieldKind,
     FieldObjectKind,
     FieldObjectOptions,
+    FieldOptions,
     FieldOrFieldObjectOptions,
+    StringFieldValidation,
 )
+from strawberry_resources.utils.pyutils import describe_value
 
 from .base import StrawberryResourceIntegration
 
@@ -60,7 +77,7 @@ except ImportError:
 if TYPE_CHECKING:
     from strawberry.types.field import StrawberryField
 
-    from strawberry_resources.types import FieldKind
+    from strawberry_resources.types import FieldChoice
 
 # Try to use the smaller/faster cache decorator if available
 try:
@@ -70,72 +87,350 @@ except AttributeError:  # pragma:nocover
 
 
 @_cache
+def _get_model_fields_index(
+    model: Type[models.Model],
+) -> Dict[str, Union[models.Field, models.ForeignObjectRel]]:
+    index: Dict[str, Union[models.Field, models.ForeignObjectRel]] = {}
+    for f in model._meta.get_fields():
+        name = cast(str, resolve_model_field_name(f, is_input=False, is_filter=False))
+        # Keep the first match, the same one a linear scan would have found
+        index.setdefault(name, f)
+
+    return index
+
+
 def _get_model_field(
     model: Type[models.Model],
     field: str,
 ) -> Optional[Union[models.Field, models.ForeignObjectRel]]:
-    meta = model._meta
-    for f in meta.get_fields():
-        name = cast(str, resolve_model_field_name(f, is_input=False, is_filter=False))
-        if name == field:
-            return f
+    return _get_model_fields_index(model).get(field)
 
-    return None
 
+def clear_model_fields_cache():
+    """Clear the cached model fields index, model properties' options and fingerprints.
 
-def get_extra_mappings() -> Dict[type, "FieldKind"]:
-    from strawberry_resources.types import FieldKind
+    This should be called when models get (re)registered after being introspected,
+    e.g. when creating models dynamically in tests.
+    """
+    _get_model_fields_index.cache_clear()
+    _get_property_extras.cache_clear()
+    get_model_fingerprint.cache_clear()
+
+
+def _on_class_prepared(sender: Type[models.Model], **kwargs):
+    # Registering a model might add reverse relations to already indexed ones
+    clear_model_fields_cache()
+
+
+class_prepared.connect(_on_class_prepared, dispatch_uid="strawberry_resources")
 
+# Choices built from model fields' choices, keyed by their contents. The same
+# choices are usually shared by lots of fields (e.g. countries or currencies)
+_field_choices: Dict[Tuple[Any, ...], Tuple["FieldChoice", ...]] = {}
+
+
+@_cache
+def _get_enum_choices(choices_cls: Type[models.Choices]) -> Tuple["FieldChoice", ...]:
+    from strawberry_resources.types import FieldChoice
+
+    return tuple(
+        FieldChoice(label=lbl, value=cast(JSON, value))
+        for lbl, value in zip(choices_cls.labels, choices_cls.names)
+    )
+
+
+def clear_choices_cache():
+    """Clear the choices interned for model fields and `models.Choices` enums."""
+    _field_choices.clear()
+    _get_enum_choices.cache_clear()
+
+
+def _get_field_choices(items: Iterable[Any]) -> Tuple["FieldChoice", ...]:
+    from strawberry_resources.types import FieldChoice
+
+    if isinstance(items, dict):
+        items = items.items()
+
+    choices: List[FieldChoice] = []
+    for value, label in items:
+        if isinstance(label, (list, tuple)):
+            group = value
+            for group_value, group_lbl in label:
+                choices.append(
+                    FieldChoice(label=group_lbl, value=group_value, group=group)
+                )
+        else:
+            choices.append(FieldChoice(label=label, value=value))
+
+    # Lazy labels are compared by identity, as they might differ once translated.
+    # They are kept alive by the cached choices, so their ids are not reused
+    # The value type is part of the key, since e.g. `True` and `1` are equal
+    key = tuple(
+        (
+            type(c.value),
+            c.value,
+            c.group,
+            c.label if isinstance(c.label, str) else (type(c.label), id(c.label)),
+        )
+        for c in choices
+    )
+    try:
+        return _field_choices.setdefault(key, tuple(choices))
+    except TypeError:
+        # Unhashable values, do not intern those
+        return tuple(choices)
+
+
+def get_extra_mappings() -> Dict[type, "FieldKind"]:
     return {
         DjangoImageType: FieldKind.IMAGE,
         DjangoFileType: FieldKind.FILE,
     }
 
 
+_ModelField = Union[models.Field, models.ForeignObjectRel]
+FieldKindHandler = Callable[[Any, "StrawberryField"], FieldOptions]
+
+# The kind of each model field class, or a handler returning the field options
+_field_kinds: Dict[type, Union[FieldKind, FieldKindHandler]] = {}
+# The registered kind resolved for each concrete model field class
+_field_kinds_cache: Dict[type, Optional[Union[FieldKind, FieldKindHandler]]] = {}
+
+
+def register_field_kind(
+    field_cls: Type[_ModelField],
+    kind: Union[FieldKind, FieldKindHandler],
+):
+    """Register the kind of a model field class, also used by its subclasses.
+
+    `kind` can also be a callable receiving the model field and the strawberry
+    field, returning the options for it (e.g. the kind and a validation). The
+    most specific class registered in the model field's MRO is used.
+    """
+    _field_kinds[field_cls] = kind
+    _field_kinds_cache.clear()
+
+
+def _get_field_kind(
+    field_cls: Type[_ModelField],
+) -> Optional[Union[FieldKind, FieldKindHandler]]:
+    try:
+        return _field_kinds_cache[field_cls]
+    except KeyError:
+        pass
+
+    kind = _field_kinds_cache[field_cls] = next(
+        (_field_kinds[cls] for cls in field_cls.__mro__ if cls in _field_kinds),
+        None,
+    )
+    return kind
+
+
+def _char_field_options(
+    dj_field: models.CharField,
+    field: "StrawberryField",
+) -> FieldOptions:
+    return {
+        "kind": FieldKind.STRING,
+        "validation": StringFieldValidation(
+            required=not isinstance(field.type, StrawberryOptional),
+            min_length=0 if dj_field.blank else 1,
+            max_length=dj_field.max_length,
+        ),
+    }
+
+
+def _decimal_field_options(
+    dj_field: models.DecimalField,
+    field: "StrawberryField",
+) -> FieldOptions:
+    return {
+        "kind": FieldKind.DECIMAL,
+        "validation": DecimalFieldValidation(
+            required=not isinstance(field.type, StrawberryOptional),
+            max_digits=dj_field.max_digits,
+            decimal_places=dj_field.decimal_places,
+        ),
+    }
+
+
+def _many_field_options(
+    dj_field: _ModelField, field: "StrawberryField"
+) -> FieldOptions:
+    return {"kind": FieldKind.ID, "multiple": True}
+
+
+def _point_field_options(dj_field: Any, field: "StrawberryField") -> FieldOptions:
+    return {
+        "kind": (
+            FieldKind.GEOPOINT
+            if dj_field.srid == 4326  # noqa: PLR2004
+            else FieldKind.POINT
+        ),
+    }
+
+
+# Subclasses get the kind of their closest registered base, e.g. `URLField` and
+# `TextChoicesField` are handled as a `CharField`
+register_field_kind(models.ImageField, FieldKind.IMAGE)
+register_field_kind(models.FileField, FieldKind.FILE)
+if PhoneNumberField is not None:
+    register_field_kind(PhoneNumberField, FieldKind.PHONE)
+register_field_kind(models.TextField, FieldKind.MULTILINE)
+register_field_kind(models.IPAddressField, FieldKind.IP)
+register_field_kind(models.GenericIPAddressField, FieldKind.IP)
+register_field_kind(models.EmailField, FieldKind.EMAIL)
+register_field_kind(models.CharField, _char_field_options)
+register_field_kind(models.UUIDField, FieldKind.UUID)
+register_field_kind(models.DecimalField, _decimal_field_options)
+register_field_kind(models.FloatField, FieldKind.FLOAT)
+# Also covers BigAutoField and SmallAutoField, which are not AutoField subclasses
+register_field_kind(AutoFieldMixin, FieldKind.ID)
+register_field_kind(models.IntegerField, FieldKind.INT)
+register_field_kind(models.BooleanField, FieldKind.BOOLEAN)
+register_field_kind(models.DateTimeField, FieldKind.DATETIME)
+register_field_kind(models.DateField, FieldKind.DATE)
+register_field_kind(models.TimeField, FieldKind.TIME)
+register_field_kind(models.ForeignKey, FieldKind.ID)
+register_field_kind(models.OneToOneRel, FieldKind.ID)
+register_field_kind(models.ManyToManyField, _many_field_options)
+register_field_kind(models.ManyToManyRel, _many_field_options)
+register_field_kind(models.ManyToOneRel, _many_field_options)
+register_field_kind(models.JSONField, FieldKind.JSON)
+if PolygonField is not None:
+    register_field_kind(PolygonField, FieldKind.POLYGON)
+if PointField is not None:
+    register_field_kind(PointField, _point_field_options)
+
+
+# Model fields' attributes which affect the options of their fields
+_FINGERPRINT_FIELD_ATTRS = (
+    "verbose_name",
+    "help_text",
+    "max_length",
+    "null",
+    "blank",
+    "default",
+    "choices",
+    "max_digits",
+    "decimal_places",
+    "srid",
+)
+
+
+class _TypeInfo(NamedTuple):
+    """Per-type data shared by all the fields of a type."""
+
+    model: Optional[Type[models.Model]]
+    # Extras annotated in the return type of the model's properties, by name
+    property_extras: Dict[str, Tuple[Any, ...]]
+    orderable: Optional[FrozenSet[str]]
+    filterable: Optional[FrozenSet[str]]
+
+
+@_cache
+def _get_property_extras(model: Type[models.Model]) -> Dict[str, Tuple[Any, ...]]:
+    extras: Dict[str, Tuple[Any, ...]] = {}
+    if ModelProperty is None:
+        return extras
+
+    # Walk the MRO the other way around, so that subclasses' attributes win
+    for cls in reversed(model.__mro__):
+        for name, attr in vars(cls).items():
+            if (
+                isinstance(attr, ModelProperty)
+                and get_origin(
+                    annotation := attr.func.__annotations__.get("return"),
+                )
+                is Annotated
+            ):
+                extras[name] = get_args(annotation)[1:]
+            else:
+                extras.pop(name, None)
+
+    return extras
+
+
+@_cache
+def _get_field_names(cls: type) -> FrozenSet[str]:
+    # Order and filters types are usually shared by multiple types
+    return frozenset(f.name for f in dataclasses.fields(cls))
+
+
+def _get_type_info(origin: Type[WithStrawberryObjectDefinition]) -> _TypeInfo:
+    if (dj_type := get_django_definition(origin)) is None:
+        return _TypeInfo(
+            model=None,
+            property_extras={},
+            orderable=None,
+            filterable=None,
+        )
+
+    order = dj_type.order
+    filters = dj_type.filters
+    return _TypeInfo(
+        model=dj_type.model,
+        property_extras=_get_property_extras(dj_type.model),
+        orderable=_get_field_names(order) if order and order is not UNSET else None,
+        filterable=(
+            _get_field_names(filters) if filters and filters is not UNSET else None
+        ),
+    )
+
+
 def get_field_options(
     origin: Type[WithStrawberryObjectDefinition],
     field: "StrawberryField",
     resolved_type: type,
     is_list: bool,
+) -> FieldOrFieldObjectOptions:
+    return _get_field_options(_get_type_info(origin), field, resolved_type, is_list)
+
+
+def get_fields_options(
+    origin: Type[WithStrawberryObjectDefinition],
+    fields: List[Tuple["StrawberryField", type, bool]],
+) -> List[Optional[FieldOrFieldObjectOptions]]:
+    from strawberry_resources.types import HiddenFieldError
+
+    type_info = _get_type_info(origin)
+    results: List[Optional[FieldOrFieldObjectOptions]] = []
+    for field, resolved_type, is_list in fields:
+        try:
+            results.append(
+                _get_field_options(type_info, field, resolved_type, is_list),
+            )
+        except HiddenFieldError:  # noqa: PERF203
+            results.append(None)
+
+    return results
+
+
+def _get_field_options(
+    type_info: _TypeInfo,
+    field: "StrawberryField",
+    resolved_type: type,
+    is_list: bool,
 ) -> FieldOrFieldObjectOptions:
     from strawberry_resources.types import (
-        DecimalFieldValidation,
         FieldChoice,
-        FieldKind,
-        FieldOptions,
         FieldOptionsConfig,
         HiddenField,
         HiddenFieldError,
-        StringFieldValidation,
     )
 
     options: FieldOptions = {}
-
-    if (dj_type := get_django_definition(origin)) is not None:
-        model = dj_type.model
-        model_attr = getattr(model, field.name, None)
-    else:
-        model = None
-        model_attr = None
+    model = type_info.model
 
     # Try to populate options from the model property
-    if (
-        ModelProperty is not None
-        and model_attr is not None
-        and isinstance(model_attr, ModelProperty)
-        and (
-            get_origin(annotation := model_attr.func.__annotations__.get("return"))
-            is Annotated
-        )
-    ):
-        for opt in get_args(annotation)[1:]:
-            if isinstance(opt, HiddenField):
-                raise HiddenFieldError
+    for opt in type_info.property_extras.get(field.name, ()):
+        if isinstance(opt, HiddenField):
+            raise HiddenFieldError
 
-            if not isinstance(opt, FieldOptionsConfig):
-                continue
+        if not isinstance(opt, FieldOptionsConfig):
+            continue
 
-            options.update(opt.options)
+        options.update(opt.options)
 
     dj_field = _get_model_field(model, field.name) if model is not None else None
 
@@ -163,27 +458,12 @@ def get_field_options(
     )
     if isinstance(resolved_type, type) and issubclass(resolved_type, models.Choices):
         if choices is None:
-            choices = [
-                FieldChoice(label=lbl, value=cast(JSON, value))
-                for lbl, value in zip(resolved_type.labels, resolved_type.names)
-            ]
+            choices = _get_enum_choices(resolved_type)
         default_value = (
             resolved_type(default_value).name if default_value is not None else None
         )
     elif choices is None and dj_field and (items := getattr(dj_field, "choices", None)):
-        if isinstance(items, dict):
-            items = items.items()
-
-        choices = []
-        for value, label in items:
-            if isinstance(label, (list, tuple)):
-                group = value
-                for group_value, group_lbl in label:
-                    choices.append(
-                        FieldChoice(label=group_lbl, value=group_value, group=group)
-                    )
-            else:
-                choices.append(FieldChoice(label=label, value=value))
+        choices = _get_field_choices(items)
 
     # FIXME: We could call default_value(), but for places like timezone.now it is worse than
     # passing it. We might need to find a proper solution in the future
@@ -194,15 +474,10 @@ def get_field_options(
     if choices is not None:
         options["choices"] = choices
 
-    if dj_type:
-        if (order := dj_type.order) and order is not UNSET:
-            options["orderable"] = field.name in {
-                f.name for f in dataclasses.fields(order)
-            }
-        if (filters := dj_type.filters) and filters is not UNSET:
-            options["filterable"] = field.name in {
-                f.name for f in dataclasses.fields(filters)
-            }
+    if type_info.orderable is not None:
+        options["orderable"] = field.name in type_info.orderable
+    if type_info.filterable is not None:
+        options["filterable"] = field.name in type_info.filterable
 
     if dj_field:
         if (label := getattr(dj_field, "verbose_name", None) or None) is not None:
@@ -211,79 +486,90 @@ def get_field_options(
         if (help_text := getattr(dj_field, "help_Text", None) or None) is not None:
             options["help_text"] = help_text
 
-        if isinstance(dj_field, models.ImageField):
-            options["kind"] = FieldKind.IMAGE
-        elif isinstance(dj_field, models.FileField):
-            options["kind"] = FieldKind.FILE
-        elif PhoneNumberField is not None and isinstance(dj_field, PhoneNumberField):
-            options["kind"] = FieldKind.PHONE
-        elif isinstance(dj_field, models.TextField):
-            options["kind"] = FieldKind.MULTILINE
-        elif isinstance(
-            dj_field, (models.IPAddressField, models.GenericIPAddressField)
-        ):
-            options["kind"] = FieldKind.IP
-        elif isinstance(dj_field, models.EmailField):
-            options["kind"] = FieldKind.EMAIL
-        elif isinstance(dj_field, models.CharField):
-            options["kind"] = FieldKind.STRING
-            options["validation"] = StringFieldValidation(
-                required=not isinstance(field.type, StrawberryOptional),
-                min_length=0 if dj_field.blank else 1,
-                max_length=dj_field.max_length,
-            )
-        elif isinstance(dj_field, models.UUIDField):
-            options["kind"] = FieldKind.UUID
-        elif isinstance(dj_field, models.URLField):
-            options["kind"] = FieldKind.URL
-        elif isinstance(dj_field, models.DecimalField):
-            options["kind"] = FieldKind.DECIMAL
-            options["validation"] = DecimalFieldValidation(
-                required=not isinstance(field.type, StrawberryOptional),
-                max_digits=dj_field.max_digits,
-                decimal_places=dj_field.decimal_places,
-            )
-        elif isinstance(dj_field, models.FloatField):
-            options["kind"] = FieldKind.FLOAT
-        elif isinstance(dj_field, models.AutoField):
-            options["kind"] = FieldKind.ID
-        elif isinstance(dj_field, models.IntegerField):
-            options["kind"] = FieldKind.INT
-        elif isinstance(dj_field, models.BooleanField):
-            options["kind"] = FieldKind.BOOLEAN
-        elif isinstance(dj_field, models.DateTimeField):
-            options["kind"] = FieldKind.DATETIME
-        elif isinstance(dj_field, models.DateField):
-            options["kind"] = FieldKind.DATE
-        elif isinstance(dj_field, models.TimeField):
-            options["kind"] = FieldKind.TIME
-        elif isinstance(
-            dj_field,
-            (models.ForeignKey, models.OneToOneRel, models.OneToOneField),
-        ):
-            options["kind"] = FieldKind.ID
-        elif isinstance(
-            dj_field,
-            (models.ManyToManyField, models.ManyToManyRel, models.ManyToOneRel),
-        ):
-            options["kind"] = FieldKind.ID
-            options["multiple"] = True
-        elif isinstance(dj_field, models.JSONField):
-            options["kind"] = FieldKind.JSON
-        elif PolygonField is not None and isinstance(dj_field, PolygonField):
-            options["kind"] = FieldKind.POLYGON
-        elif PointField is not None and isinstance(dj_field, PointField):
-            options["kind"] = (
-                FieldKind.GEOPOINT
-                if dj_field.srid == 4326  # type: ignore  # noqa: PLR2004
-                else FieldKind.POINT
-            )
+        if (kind := _get_field_kind(type(dj_field))) is not None:
+            if isinstance(kind, FieldKind):
+                options["kind"] = kind
+            else:
+                options.update(kind(dj_field, field))
 
     return options
 
 
+@_cache
+def get_model_fingerprint(model: Type[models.Model]) -> str:
+    """Return a fingerprint of the model's state used to compute the options.
+
+    It covers the model fields' attributes (e.g. `max_length`, `verbose_name`
+    or `choices`) and the model properties' annotated options. It does not depend
+    on the active language nor on the process, so it can be compared between
+    processes.
+    """
+    meta = model._meta
+    h = hashlib.sha256()
+    h.update(f"{meta.label}:{describe_value(meta.verbose_name)}\n".encode())
+    for f in meta.get_fields():
+        related_model = getattr(f, "related_model", None)
+        description = (
+            f.name,
+            type(f),
+            *(getattr(f, attr, None) for attr in _FINGERPRINT_FIELD_ATTRS),
+            related_model._meta.label if isinstance(related_model, type) else None,
+        )
+        h.update(f"{describe_value(description)}\n".encode())
+
+    h.update(describe_value(sorted(_get_property_extras(model).items())).encode())
+    return h.hexdigest()
+
+
+def get_type_fingerprint(origin: Type[WithStrawberryObjectDefinition]) -> Optional[str]:
+    if (type_info := _get_type_info(origin)).model is None:
+        return None
+
+    return repr(
+        (
+            type_info.model._meta.label,
+            get_model_fingerprint(type_info.model),
+            sorted(type_info.orderable) if type_info.orderable is not None else None,
+            sorted(type_info.filterable) if type_info.filterable is not None else None,
+        ),
+    )
+
+
+def _is_django_field_type(type_: Any) -> bool:
+    while True:
+        if isinstance(type_, StrawberryContainer):
+            type_ = type_.of_type
+        elif get_origin(type_) is Annotated:
+            type_ = get_args(type_)[0]
+        elif isinstance(type_, LazyType):
+            type_ = type_.resolve_type()
+        else:
+            break
+
+    if isinstance(type_, EnumDefinition):
+        type_ = type_.wrapped_cls
+
+    return isinstance(type_, type) and (
+        issubclass(type_, models.Choices)
+        or (ListInput is not None and issubclass(type_, ListInput))
+    )
+
+
+def applies_to(origin: Type[WithStrawberryObjectDefinition]) -> bool:
+    if get_django_definition(origin) is not None:
+        return True
+
+    # Types not backed by a model can still use django choices or ListInput
+    type_def = get_object_definition(origin, strict=True)
+    return any(_is_django_field_type(f.type) for f in type_def.fields)
+
+
 integration = StrawberryResourceIntegration(
     name="django",
     get_extra_mappings=get_extra_mappings,
     get_field_options=get_field_options,
+    get_fields_options=get_fields_options,
+    get_type_fingerprint=get_type_fingerprint,
+    applies_to=applies_to,
+    clear_cache=clear_choices_cache,
 )
@@ -0,0 +1,94 @@
+import contextlib
+import contextvars
+import dataclasses
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# A context variable, so that resolutions running in other threads (or in other
+# tasks) do not get recorded into the profile
+_active_profile: "contextvars.ContextVar[Optional[Profile]]" = contextvars.ContextVar(
+    "strawberry_resources_profile",
+    default=None,
+)
+
+
+@dataclasses.dataclass
+class ProfileEntry:
+    """Time spent and number of calls for something during resolution.
+
+    `kind` is one of:
+        type:
+            Resolving the fields of a type, without its nested types.
+        field:
+            Resolving a single field (`<type>.<field>`), after the
+            integrations' hooks ran for its type.
+        annotations:
+            Parsing the annotations of a type.
+        integration:
+            Calling an integration's hook (`<integration>.<hook>`), once per
+            field or once per type for `get_fields_options`.
+    """
+
+    kind: str
+    name: str
+    calls: int = 0
+    time: float = 0.0
+
+
+@dataclasses.dataclass
+class Profile:
+    """Timings collected while resolving resources."""
+
+    entries: Dict[Tuple[str, str], ProfileEntry] = dataclasses.field(
+        default_factory=dict,
+    )
+    # Called for each recorded timing, with its kind, name and elapsed time
+    callback: Optional[Callable[[str, str, float], None]] = None
+
+    def record(self, kind: str, name: str, elapsed: float):
+        if (entry := self.entries.get((kind, name))) is None:
+            entry = self.entries[kind, name] = ProfileEntry(kind=kind, name=name)
+
+        entry.calls += 1
+        entry.time += elapsed
+        if self.callback is not None:
+            self.callback(kind, name, elapsed)
+
+    def top(self, n: int, *, kind: Optional[str] = None) -> List[ProfileEntry]:
+        """Return the `n` entries that took the most time."""
+        entries = (e for e in self.entries.values() if kind is None or e.kind == kind)
+        return sorted(entries, key=lambda e: e.time, reverse=True)[:n]
+
+    def format(self, n: int) -> str:
+        """Format the `n` hottest entries as a table."""
+        lines = [f"{'kind':<12} {'calls':>8} {'time (ms)':>12}  name"]
+        lines.extend(
+            f"{e.kind:<12} {e.calls:>8} {e.time * 1000:>12.3f}  {e.name}"
+            for e in self.top(n)
+        )
+        return "\n".join(lines)
+
+
+def get_active_profile() -> Optional[Profile]:
+    return _active_profile.get()
+
+
+@contextlib.contextmanager
+def profile(
+    callback: Optional[Callable[[str, str, float], None]] = None,
+) -> Iterator[Profile]:
+    """Profile the resources resolved inside the block.
+
+    Time and calls are recorded per type, per field and per integration hook.
+    The optional `callback` gets called with the kind, the name and the elapsed
+    time of each recorded timing.
+
+    Note that only resources which are not cached yet will be resolved, and
+    that only the resolutions running in the current context (i.e. the current
+    thread or task) get recorded.
+    """
+    active = Profile(callback=callback)
+    token = _active_profile.set(active)
+    try:
+        yield active
+    finally:
+        _active_profile.reset(token)
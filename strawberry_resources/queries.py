@@ -3,8 +3,18 @@ from typing import List, Optional
 import strawberry
 from strawberry.types.info import Info
 
-from .resolver import get_resource_by_name, get_resource_map
-from .types import Resource
+from .choices import get_choices_page
+from .compact import FieldData
+from .resolver import (
+    _get_compact_resource,
+    _ResolveOptions,
+    get_resource_by_name,
+    get_resource_map,
+)
+from .types import FieldChoicePage, Resource
+
+# The maximum number of choices returned by a single `resourceChoices` query
+MAX_CHOICES_PAGE_SIZE = 500
 
 
 @strawberry.type
@@ -18,3 +28,37 @@ class Query:
     def resource(self, info: Info, name: str) -> Optional[Resource]:
         """Retrieve the schema settings for the given resource."""
         return get_resource_by_name(info.schema, name)
+
+    @strawberry.field
+    def resource_choices(
+        self,
+        info: Info,
+        resource: str,
+        field: str,
+        search: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> Optional[FieldChoicePage]:
+        """Retrieve a page of the choices of a resource's field.
+
+        When searching, only the choices whose label starts with the search
+        (ignoring the case) are returned.
+        """
+        data = _get_compact_resource(info.schema, resource, _ResolveOptions())
+        if data is None:
+            return None
+
+        field_data = next(
+            (f for f in data.fields if isinstance(f, FieldData) and f.name == field),
+            None,
+        )
+        if field_data is None or field_data.choices is None:
+            return None
+
+        choices, total_count = get_choices_page(
+            field_data.choices,
+            search=search,
+            offset=offset,
+            limit=min(limit, MAX_CHOICES_PAGE_SIZE),
+        )
+        return FieldChoicePage(choices=choices, total_count=total_count)
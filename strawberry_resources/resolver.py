@@ -1,14 +1,28 @@
+import asyncio
 import contextlib
+import contextvars
+import dataclasses
 import datetime
 import decimal
+import enum
+import hashlib
+import logging
+import threading
+import time
 import uuid
 import weakref
 from typing import (
     Any,
+    Callable,
     Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
     Optional,
+    Set,
     Tuple,
     Type,
+    TypeVar,
     _GenericAlias,  # type: ignore  # noqa: PLC2701
     cast,
 )
@@ -22,21 +36,38 @@ from strawberry.types import get_object_definition, has_object_definition, objec
 from strawberry.types.base import (
     StrawberryContainer,
     StrawberryList,
+    StrawberryObjectDefinition,
     StrawberryOptional,
     WithStrawberryObjectDefinition,
 )
 from strawberry.types.enum import EnumDefinition
-from strawberry.types.scalar import ScalarWrapper
+from strawberry.types.field import StrawberryField
+from strawberry.types.scalar import ScalarDefinition, ScalarWrapper
+from strawberry.types.union import StrawberryUnion
 from strawberry.utils.str_converters import to_camel_case
 from typing_extensions import Annotated, TypeAlias, get_args, get_origin
 
-from .integrations.base import get_all
+from .choices import clear_indexes as clear_choices_indexes
+from .compact import (
+    FieldData,
+    FieldObjectData,
+    FieldOrFieldObjectData,
+    Materializer,
+    ResourceData,
+    intern_validation,
+)
+from .integrations import base as integrations_base
+from .integrations.base import (
+    StrawberryResourceIntegration,
+    get_all,
+    get_extra_mappings,
+)
+from .profiling import Profile, get_active_profile
+from .storage import BaseStorage, get_schema_fingerprint, get_storage
 from .types import (
     BaseFieldValidation,
-    Field,
     FieldChoice,
     FieldKind,
-    FieldObject,
     FieldObjectKind,
     FieldOptions,
     FieldOptionsConfig,
@@ -46,12 +77,18 @@ from .types import (
     Resource,
 )
 from .utils.inspect import get_possible_type_definitions
-from .utils.pyutils import dict_merge
+from .utils.pyutils import describe_value, dict_merge
 
-_TypeMap: TypeAlias = Dict[str, Resource]
+_T = TypeVar("_T")
+_TypeMap: TypeAlias = Dict[str, ResourceData]
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_DEPTH = 2
-type_name_map: Dict[Schema, Optional[_TypeMap]] = {}
+# Weakly referenced so that the cached resources get dropped with their schema
+schema_caches: Dict[Schema, "_SchemaCache"] = cast(
+    Dict[Schema, "_SchemaCache"], weakref.WeakKeyDictionary()
+)
 field_type_map: Dict[type, FieldKind] = {
     bool: FieldKind.BOOLEAN,
     str: FieldKind.STRING,
@@ -71,10 +108,30 @@ field_type_map: Dict[type, FieldKind] = {
 _original_annotations: Dict[type, Any] = cast(
     Dict[type, Any], weakref.WeakKeyDictionary()
 )
+# Annotated extras for each field in a type, keyed by the type
+_annotation_extras: Dict[type, Dict[str, Tuple[Any, ...]]] = cast(
+    Dict[type, Dict[str, Tuple[Any, ...]]], weakref.WeakKeyDictionary()
+)
+# Description of the annotated extras, used in the type's state
+_annotation_descriptions: Dict[type, str] = cast(
+    Dict[type, str], weakref.WeakKeyDictionary()
+)
+# Choices for each enum, shared by all fields using it, keyed by the enum class.
+# The definition is weakly referenced too, as it references the enum class
+_enum_choices: Dict[
+    type,
+    Tuple["weakref.ref[EnumDefinition]", Tuple[FieldChoice, ...]],
+] = cast(
+    Dict[type, Tuple["weakref.ref[EnumDefinition]", Tuple[FieldChoice, ...]]],
+    weakref.WeakKeyDictionary(),
+)
 _original_wrap_dataclass = object_type._wrap_dataclass
 
 
 def _wrap_dataclass(cls: type):
+    # The type is being (re)defined, its annotations might have changed
+    _annotation_extras.pop(cls, None)
+    _annotation_descriptions.pop(cls, None)
     with contextlib.suppress(AttributeError):
         _original_annotations[cls] = cls.__annotations__.copy()
     return _original_wrap_dataclass(cls)
@@ -85,23 +142,560 @@ def _wrap_dataclass(cls: type):
 object_type._wrap_dataclass = _wrap_dataclass
 
 
-def get_resource_map(schema: "Schema") -> _TypeMap:
-    if (type_map := type_name_map.get(schema)) is None:
-        type_map = {}
+def get_kind_map() -> Dict[type, FieldKind]:
+    """Return the effective type -> `FieldKind` mapping.
+
+    This merges `field_type_map` with the mappings provided by all integrations,
+    where the integrations' ones take precedence.
+    """
+    return {**field_type_map, **get_extra_mappings()}
+
+
+class CyclePolicy(enum.Enum):
+    """How to handle types nested inside themselves (e.g. `User -> Team -> User`).
+
+    The options here are:
+        EXPAND:
+            Keep expanding the type until `max_depth` is reached.
+        STOP:
+            Do not expand a type that is already being expanded in the current
+            path. Its `FieldObject` will be returned without any fields.
+    """
+
+    EXPAND = "expand"
+    STOP = "stop"
+
+
+class _ResolveOptions(NamedTuple):
+    max_depth: int = DEFAULT_MAX_DEPTH
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND
+
+
+@dataclasses.dataclass
+class _ResolverContext:
+    """State shared by a whole resolution run."""
+
+    max_depth: int = DEFAULT_MAX_DEPTH
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND
+    integrations: List[StrawberryResourceIntegration] = dataclasses.field(
+        default_factory=get_all,
+    )
+    kind_map: Dict[type, FieldKind] = dataclasses.field(
+        default_factory=get_kind_map,
+    )
+    # Resolved fields for a given type, keyed by (type, remaining depth, ancestors)
+    memo: Dict[Tuple[type, int, FrozenSet[type]], List[FieldOrFieldObjectData]] = (
+        dataclasses.field(default_factory=dict)
+    )
+    # Types whose fields still need to be resolved into the given list
+    pending: List[Tuple[type, int, FrozenSet[type], List[FieldOrFieldObjectData]]] = (
+        dataclasses.field(default_factory=list)
+    )
+    # Names of the types directly nested inside each type, keyed by its name
+    dependencies: Dict[str, Set[str]] = dataclasses.field(default_factory=dict)
+    # The fields of each type which are not hidden, with the integrations' options
+    type_fields: Dict[
+        type, List[Tuple["_PreparedField", FieldOrFieldObjectOptions]]
+    ] = dataclasses.field(default_factory=dict)
+    # The profile active while the current resolution runs. The context outlives
+    # the resolution for resources resolved on demand, so this gets set each time
+    profile: Optional[Profile] = None
+
+    @classmethod
+    def from_options(cls, options: _ResolveOptions):
+        return cls(max_depth=options.max_depth, cycle_policy=options.cycle_policy)
+
+
+@dataclasses.dataclass
+class _ResolutionState:
+    """Information about a resolved resource map, used to refresh it."""
+
+    dependencies: Dict[str, Set[str]]
+    # The state of each type (see `_get_type_state`), recorded when the map got
+    # resolved, so that changes made in place since then can be detected
+    type_states: Dict[str, str]
+
+
+@dataclasses.dataclass
+class _LazyResourceMap:
+    """Resources resolved on demand, before the full map gets built."""
+
+    ctx: _ResolverContext
+    resources: Dict[str, Optional[ResourceData]] = dataclasses.field(
+        default_factory=dict,
+    )
+
+
+@dataclasses.dataclass
+class _SchemaCache:
+    """Cached resources for a schema, for each set of resolve options."""
+
+    resource_maps: Dict[_ResolveOptions, _TypeMap] = dataclasses.field(
+        default_factory=dict,
+    )
+    lazy_maps: Dict[_ResolveOptions, _LazyResourceMap] = dataclasses.field(
+        default_factory=dict,
+    )
+    states: Dict[_ResolveOptions, _ResolutionState] = dataclasses.field(
+        default_factory=dict,
+    )
+    # Held while resolving resources, so that concurrent requests wait for the
+    # resolution in progress instead of starting another one
+    locks: Dict[_ResolveOptions, threading.RLock] = dataclasses.field(
+        default_factory=dict,
+    )
+    # Resource maps being resolved for async callers, per event loop
+    async_builds: Dict[
+        Tuple[_ResolveOptions, asyncio.AbstractEventLoop],
+        "asyncio.Future[_TypeMap]",
+    ] = dataclasses.field(default_factory=dict)
+    # The threads started by warm_in_background
+    warming: Dict[_ResolveOptions, threading.Thread] = dataclasses.field(
+        default_factory=dict,
+    )
+
+    def set_resource_map(self, options: _ResolveOptions, type_map: _TypeMap):
+        self.lazy_maps.pop(options, None)
+        self.resource_maps[options] = type_map
+
+    def get_lock(self, options: _ResolveOptions) -> threading.RLock:
+        # setdefault is atomic, so all threads get the same lock
+        return self.locks.setdefault(options, threading.RLock())
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    schemas: int
+
+
+@dataclasses.dataclass
+class _CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+_cache_stats = _CacheStats()
+_schema_caches_lock = threading.Lock()
+# Converts the cached resources to their strawberry types when requested
+_materializer = Materializer()
+
+
+def _get_schema_cache(schema: Schema) -> _SchemaCache:
+    if (cache := schema_caches.get(schema)) is None:
+        with _schema_caches_lock:
+            if (cache := schema_caches.get(schema)) is None:
+                cache = schema_caches[schema] = _SchemaCache()
+
+    return cache
+
+
+def _get_storage_key(schema: Schema, options: _ResolveOptions) -> str:
+    fingerprint = get_schema_fingerprint(schema)
+    if options == _ResolveOptions():
+        return fingerprint
+
+    return f"{fingerprint}-{options.max_depth}-{options.cycle_policy.value}"
+
+
+def get_resource_map(
+    schema: "Schema",
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+) -> Dict[str, Resource]:
+    return _materializer.resource_map(
+        _get_compact_map(schema, _ResolveOptions(max_depth, cycle_policy)),
+    )
+
+
+def _get_compact_map(schema: Schema, options: _ResolveOptions) -> _TypeMap:
+    cache = _get_schema_cache(schema)
+
+    if (type_map := cache.resource_maps.get(options)) is None:
+        with cache.get_lock(options):
+            # Check again, it might have been resolved while waiting for the lock
+            if (type_map := cache.resource_maps.get(options)) is None:
+                _cache_stats.misses += 1
+                return _populate_resource_map(schema, options, cache)
+
+    _cache_stats.hits += 1
+    return type_map
+
+
+async def aget_resource_map(
+    schema: "Schema",
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+) -> Dict[str, Resource]:
+    """Async version of `get_resource_map`.
+
+    Resources which are not cached yet get resolved in a thread, without blocking
+    the event loop. Concurrent calls wait for the same resolution.
+    """
+    options = _ResolveOptions(max_depth, cycle_policy)
+    cache = _get_schema_cache(schema)
+    if (type_map := cache.resource_maps.get(options)) is None:
+        loop = asyncio.get_running_loop()
+        key = (options, loop)
+        if (build := cache.async_builds.get(key)) is None:
+            # Run in the caller's context, e.g. to record into its active profile
+            build = cache.async_builds[key] = loop.run_in_executor(
+                None,
+                contextvars.copy_context().run,
+                _get_compact_map,
+                schema,
+                options,
+            )
+            build.add_done_callback(lambda _: cache.async_builds.pop(key, None))
+
+        # Do not cancel the resolution other callers are waiting for
+        type_map = await asyncio.shield(build)
+    else:
+        _cache_stats.hits += 1
+
+    return _materializer.resource_map(type_map)
+
+
+def _populate_resource_map(
+    schema: Schema,
+    options: _ResolveOptions,
+    cache: _SchemaCache,
+) -> _TypeMap:
+    # Computed before resolving anything, so that they describe what the
+    # resources got resolved from
+    type_states = _get_type_states(schema, get_all())
+    if (storage := get_storage()) is None:
+        type_map = _build_resource_map(schema, options, cache, type_states)
+    else:
+        key = _get_storage_key(schema, options)
+        state = _combine_fingerprints(type_states)
+        if (type_map := storage.load(key, state=state)) is None:
+            type_map = _build_resource_map(schema, options, cache, type_states)
+            _save_resource_map(storage, key, type_map, state=state)
+
+    cache.set_resource_map(options, type_map)
+    return type_map
+
+
+def _save_resource_map(
+    storage: BaseStorage,
+    key: str,
+    type_map: _TypeMap,
+    *,
+    state: Optional[str],
+):
+    try:
+        storage.save(key, type_map, state=state)
+    except Exception:
+        # The resources are cached anyway, do not fail because of the storage
+        logger.exception("Could not store the resources in %r", storage)
+
+
+def _build_resource_map(
+    schema: Schema,
+    options: _ResolveOptions,
+    cache: _SchemaCache,
+    type_states: Dict[str, str],
+) -> _TypeMap:
+    type_map: _TypeMap = {}
+
+    # Reuse whatever was already resolved on demand by get_resource_by_name
+    lazy_map = cache.lazy_maps.get(options) or _LazyResourceMap(
+        ctx=_ResolverContext.from_options(options),
+    )
+    for type_def in _iter_type_definitions(schema):
+        resource = lazy_map.resources.get(type_def.name)
+        if resource is None:
+            resource = _resolve_resource(type_def, lazy_map.ctx)
+
+        type_map[resource.name] = resource
+
+    cache.states[options] = _ResolutionState(
+        dependencies=lazy_map.ctx.dependencies,
+        type_states=type_states,
+    )
+    return type_map
+
+
+def get_resource_by_name(
+    schema: "Schema",
+    name: str,
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+) -> Optional[Resource]:
+    resource = _get_compact_resource(
+        schema,
+        name,
+        _ResolveOptions(max_depth, cycle_policy),
+    )
+    return _materializer.resource(resource) if resource is not None else None
+
+
+def _get_compact_resource(
+    schema: Schema,
+    name: str,
+    options: _ResolveOptions,
+) -> Optional[ResourceData]:
+    cache = _get_schema_cache(schema)
+
+    if (type_map := cache.resource_maps.get(options)) is None:
+        # Resources resolved on demand share their context, which is not thread
+        # safe, and the full map might be getting resolved in the meantime
+        with cache.get_lock(options):
+            if (type_map := cache.resource_maps.get(options)) is None:
+                return _get_lazy_resource(schema, name, options, cache)
+
+    _cache_stats.hits += 1
+    return type_map.get(name)
+
+
+def _get_lazy_resource(
+    schema: Schema,
+    name: str,
+    options: _ResolveOptions,
+    cache: _SchemaCache,
+) -> Optional[ResourceData]:
+    # Avoid resolving the whole schema when only one resource is required.
+    # Only the given type and the ones reachable from it will be resolved.
+    lazy_map = cache.lazy_maps.get(options)
+    if lazy_map is None:
+        # Loading the whole map from the storage is cheaper than resolving anything
+        if (storage := get_storage()) is not None and (
+            type_map := storage.load(
+                _get_storage_key(schema, options),
+                state=get_state_fingerprint(schema),
+            )
+        ) is not None:
+            _cache_stats.hits += 1
+            cache.set_resource_map(options, type_map)
+            return type_map.get(name)
+
+        lazy_map = cache.lazy_maps[options] = _LazyResourceMap(
+            ctx=_ResolverContext.from_options(options),
+        )
+
+    if name not in lazy_map.resources:
+        _cache_stats.misses += 1
+        type_def = _find_type_definition(schema, name)
+        lazy_map.resources[name] = (
+            _resolve_resource(type_def, lazy_map.ctx) if type_def is not None else None
+        )
+    else:
+        _cache_stats.hits += 1
+
+    return lazy_map.resources[name]
+
+
+def invalidate(schema: Optional[Schema] = None):
+    """Drop the cached resources for the given schema.
+
+    If no schema is given, the cached resources for all schemas will be dropped.
+    """
+    if schema is None:
+        schema_caches.clear()
+    else:
+        schema_caches.pop(schema, None)
+
+
+def warm(
+    schema: Schema,
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+) -> Dict[str, Resource]:
+    """Resolve and cache all resources for the given schema."""
+    return get_resource_map(schema, max_depth=max_depth, cycle_policy=cycle_policy)
+
+
+def warm_in_background(
+    schema: Schema,
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+) -> Optional[threading.Thread]:
+    """Resolve and cache all resources for the given schema in a daemon thread.
+
+    Resources requested while the thread is running will wait for it to finish,
+    instead of resolving them again. The started thread is returned, or `None`
+    when the resources are already resolved.
+    """
+    options = _ResolveOptions(max_depth, cycle_policy)
+    cache = _get_schema_cache(schema)
+    locked = threading.Event()
+
+    def _warm():
+        with cache.get_lock(options):
+            locked.set()
+            try:
+                _get_compact_map(schema, options)
+            finally:
+                with _schema_caches_lock:
+                    del cache.warming[options]
+
+    # Make sure concurrent callers do not start a thread each
+    with _schema_caches_lock:
+        if (thread := cache.warming.get(options)) is not None:
+            return thread
+        if options in cache.resource_maps:
+            return None
+
+        thread = cache.warming[options] = threading.Thread(
+            target=_warm,
+            name="strawberry-resources-warm-up",
+            daemon=True,
+        )
+        thread.start()
+
+    # Only return once the thread holds the lock, so that requests arriving after
+    # this returns will wait for it
+    locked.wait()
+    return thread
+
+
+def refresh(
+    schema: Schema,
+    previous: Schema,
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+) -> Dict[str, Resource]:
+    """Resolve the resources for `schema`, reusing the ones resolved for `previous`.
+
+    This is useful when the schema gets rebuilt with only some of its types
+    changed (e.g. on autoreload). Only the types whose fingerprint changed, and
+    the resources embedding them, will be resolved again.
+    """
+    options = _ResolveOptions(max_depth, cycle_policy)
+    cache = _get_schema_cache(schema)
+    if (type_map := cache.resource_maps.get(options)) is None:
+        with cache.get_lock(options):
+            if (type_map := cache.resource_maps.get(options)) is None:
+                type_map = _refresh_resource_map(schema, previous, options, cache)
+
+    return _materializer.resource_map(type_map)
+
+
+def _refresh_resource_map(
+    schema: Schema,
+    previous: Schema,
+    options: _ResolveOptions,
+    cache: _SchemaCache,
+) -> _TypeMap:
+    _cache_stats.misses += 1
+    max_depth = options.max_depth
+    prev_cache = _get_schema_cache(previous)
+    prev_type_map = prev_cache.resource_maps.get(options)
+    prev_state = prev_cache.states.get(options)
+    if prev_type_map is None or prev_state is None:
+        # Nothing to reuse, e.g. the resources were loaded from a storage
+        return _populate_resource_map(schema, options, cache)
+
+    ctx = _ResolverContext.from_options(options)
+    type_states = _get_type_states(schema, ctx.integrations)
+    prev_type_defs = {t.name: t for t in _iter_type_definitions(previous)}
+    changed = set()
+    for type_def in _iter_type_definitions(schema):
+        name = type_def.name
+        prev_type_def = prev_type_defs.get(name)
+        if (
+            prev_type_def is None
+            or prev_state.type_states.get(name) != type_states[name]
+            # Types shared by both schemas have the same fields, only the ones
+            # redefined since (e.g. reloaded) need to be compared
+            or (
+                prev_type_def is not type_def
+                and _get_fields_fingerprint(prev_type_def)
+                != _get_fields_fingerprint(type_def)
+            )
+        ):
+            changed.add(name)
+
+    type_map = {}
+    for type_def in _iter_type_definitions(schema):
+        name = type_def.name
+        if (resource := prev_type_map.get(name)) is None or (
+            _get_embedded_types(name, prev_state.dependencies, max_depth) & changed
+        ):
+            resource = _resolve_resource(type_def, ctx)
+
+        type_map[name] = resource
 
-        for resource in resolve_all(schema):
-            type_map[resource.name] = resource
+    dependencies = {
+        name: deps
+        for name, deps in prev_state.dependencies.items()
+        if name in type_states and name not in changed
+    }
+    dependencies.update(ctx.dependencies)
 
-        type_name_map[schema] = type_map
+    cache.set_resource_map(options, type_map)
+    cache.states[options] = _ResolutionState(
+        dependencies=dependencies,
+        type_states=type_states,
+    )
+    if (storage := get_storage()) is not None:
+        _save_resource_map(
+            storage,
+            _get_storage_key(schema, options),
+            type_map,
+            state=_combine_fingerprints(type_states),
+        )
 
     return type_map
 
 
-def get_resource_by_name(schema: "Schema", name: str) -> Optional[Resource]:
-    return get_resource_map(schema).get(name)
+def cache_info() -> CacheInfo:
+    """Return statistics about the resources cache.
+
+    `hits` and `misses` count the lookups that were served from the cache and the
+    ones that required resolving types, while `schemas` is the number of schemas
+    currently cached.
+    """
+    return CacheInfo(
+        hits=_cache_stats.hits,
+        misses=_cache_stats.misses,
+        schemas=sum(
+            1
+            for cache in schema_caches.values()
+            if cache.resource_maps or cache.lazy_maps
+        ),
+    )
+
 
+def cache_clear():
+    """Clear the resources cache for all schemas and reset its statistics."""
+    invalidate()
+    _annotation_extras.clear()
+    _annotation_descriptions.clear()
+    _enum_choices.clear()
+    _materializer.clear()
+    clear_choices_indexes()
+    # Only the ones already loaded, there is nothing cached by the others
+    for integration in list(integrations_base.integrations.values()):
+        if integration.clear_cache is not None:
+            integration.clear_cache()
+    _cache_stats.hits = 0
+    _cache_stats.misses = 0
 
-def resolve_all(schema: Schema):
+
+def resolve_all(
+    schema: Schema,
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+):
+    # Nested types are shared between resources, make sure each one
+    # of them gets resolved only once per run
+    ctx = _ResolverContext(max_depth=max_depth, cycle_policy=cycle_policy)
+    materializer = Materializer()
+
+    for type_def in _iter_type_definitions(schema):
+        yield materializer.resource(_resolve_resource(type_def, ctx))
+
+
+def _iter_type_definitions(schema: Schema):
     seen: set[str] = set()
 
     for type_ in schema.schema_converter.type_map.values():
@@ -109,176 +703,648 @@ def resolve_all(schema: Schema):
             if type_def.name in seen:
                 continue
 
-            yield Resource(
-                name=type_def.name,
-                fields=list(
-                    resolve_fields_for_type(
-                        cast(Type[WithStrawberryObjectDefinition], type_def.origin),
-                        # We are resolving all types, no need to get more deep than 2
-                        max_depth=2,
-                    ),
-                ),
-            )
+            yield type_def
             seen.add(type_def.name)
 
 
+def _find_type_definition(
+    schema: Schema,
+    name: str,
+) -> Optional[StrawberryObjectDefinition]:
+    if (type_ := schema.schema_converter.type_map.get(name)) is None:
+        return None
+
+    for type_def in get_possible_type_definitions(type_.definition):
+        if type_def.name == name:
+            return type_def
+
+    return None
+
+
+def _resolve_resource(
+    type_def: StrawberryObjectDefinition,
+    ctx: _ResolverContext,
+) -> ResourceData:
+    fields = _resolve_fields_memoized(
+        cast(Type[WithStrawberryObjectDefinition], type_def.origin),
+        ctx=ctx,
+    )
+    # Summarize those once here, so that users do not need to scan the fields
+    return ResourceData(
+        name=type_def.name,
+        fields=fields,
+        orderable_fields=tuple(
+            f.name for f in fields if isinstance(f, FieldData) and f.orderable
+        ),
+        filterable_fields=tuple(
+            f.name for f in fields if isinstance(f, FieldData) and f.filterable
+        ),
+    )
+
+
+def _get_embedded_types(
+    name: str,
+    dependencies: Dict[str, Set[str]],
+    max_depth: int,
+) -> Set[str]:
+    # A resource embeds the fields of the types nested up to max_depth + 1 levels
+    embedded = {name}
+    current = {name}
+    for _ in range(max_depth + 1):
+        current = {d for n in current for d in dependencies.get(n, ())} - embedded
+        if not current:
+            break
+
+        embedded |= current
+
+    return embedded
+
+
+def _describe_type(type_: Any) -> str:
+    if isinstance(type_, StrawberryContainer):
+        return f"{type(type_).__name__}[{_describe_type(type_.of_type)}]"
+    if isinstance(type_, LazyType):
+        return _describe_type(type_.resolve_type())
+    if isinstance(type_, EnumDefinition):
+        values = ", ".join(
+            f"{v.name}={v.value!r}:{v.description}" for v in type_.values
+        )
+        return f"enum {type_.name}({values})"
+    if isinstance(type_, ScalarWrapper):
+        return f"scalar {type_._scalar_definition.name}"
+    if isinstance(type_, ScalarDefinition):
+        return f"scalar {type_.name}"
+    if isinstance(type_, StrawberryUnion):
+        types = ", ".join(_describe_type(t) for t in type_.types)
+        return f"union {type_.graphql_name}({types})"
+    if get_origin(type_) is Annotated:
+        inner, *extras = get_args(type_)
+        return f"Annotated[{_describe_type(inner)}, {describe_value(extras)}]"
+    if (type_def := get_object_definition(type_)) is not None:
+        return type_def.name
+
+    return repr(type_)
+
+
+def get_type_fingerprint(
+    type_def: StrawberryObjectDefinition,
+    integrations: Optional[List[StrawberryResourceIntegration]] = None,
+) -> str:
+    """Return a fingerprint of everything that affects the type's resource.
+
+    That includes its fields, their annotations and the options given by the
+    integrations' `get_type_fingerprint`. Note that nested types are identified
+    only by their names, changes on those are not reflected here. The fingerprint
+    is stable between processes.
+    """
+    if integrations is None:
+        integrations = get_all()
+
+    h = hashlib.sha256()
+    h.update(f"{_get_fields_fingerprint(type_def)}\n".encode())
+    h.update(_get_type_state(type_def, integrations).encode())
+    return h.hexdigest()
+
+
+def get_state_fingerprint(
+    schema: Schema,
+    integrations: Optional[List[StrawberryResourceIntegration]] = None,
+) -> str:
+    """Return a fingerprint of the state the schema's resources get resolved from.
+
+    Unlike the schema fingerprint, which only covers the printed schema, this
+    covers the options annotated in the types (e.g. `config(label=...)` or
+    `Hidden`) and the state the integrations introspected for them, e.g. the
+    django models backing them. It is stored alongside the resources, which get
+    resolved again when it changed. Its parts are cached per type and per model,
+    so it is cheap to check when loading stored resources.
+    """
+    if integrations is None:
+        integrations = get_all()
+
+    return _combine_fingerprints(_get_type_states(schema, integrations))
+
+
+def _combine_fingerprints(fingerprints: Dict[str, str]) -> str:
+    h = hashlib.sha256()
+    for name, fingerprint in fingerprints.items():
+        h.update(f"{name}:{fingerprint}\n".encode())
+
+    return h.hexdigest()
+
+
+def _get_fields_fingerprint(type_def: StrawberryObjectDefinition) -> str:
+    h = hashlib.sha256()
+    h.update(f"{type_def.name}:{type_def.is_input}\n".encode())
+    for field in type_def.fields:
+        h.update(
+            f"{field.name}:{field.graphql_name}:{_describe_type(field.type)}\n".encode(),
+        )
+
+    return h.hexdigest()
+
+
+def _get_type_state(
+    type_def: StrawberryObjectDefinition,
+    integrations: List[StrawberryResourceIntegration],
+) -> str:
+    """Return a fingerprint of what the type's resource depends on besides its fields.
+
+    That is its annotated options and the integrations' fingerprints for it.
+    """
+    origin = cast(Type[WithStrawberryObjectDefinition], type_def.origin)
+    if (description := _annotation_descriptions.get(origin)) is None:
+        extras = _get_annotation_extras(type_def)
+        description = _annotation_descriptions[origin] = (
+            describe_value(extras) if extras else ""
+        )
+
+    h = hashlib.sha256()
+    h.update(f"{description}\n".encode())
+    for integration in integrations:
+        if integration.get_type_fingerprint is not None:
+            h.update(
+                f"{integration.name}:{integration.get_type_fingerprint(origin)}\n".encode(),
+            )
+
+    return h.hexdigest()
+
+
+def _get_type_states(
+    schema: Schema,
+    integrations: List[StrawberryResourceIntegration],
+) -> Dict[str, str]:
+    return {
+        type_def.name: _get_type_state(type_def, integrations)
+        for type_def in _iter_type_definitions(schema)
+    }
+
+
+def _get_type_annotations(type_def: StrawberryObjectDefinition) -> Dict[str, Any]:
+    annotations = {}
+    for o in reversed(type_def.origin.__mro__):
+        annotations.update(getattr(o, "__annotations__", {}))
+
+    return annotations
+
+
+def _get_annotation_extras(
+    type_def: StrawberryObjectDefinition,
+) -> Dict[str, Tuple[Any, ...]]:
+    """Return the `Annotated` extras for each of the type's fields.
+
+    The result is cached per type, since the same type gets resolved multiple
+    times when nested inside other types.
+    """
+    origin = cast(Type[WithStrawberryObjectDefinition], type_def.origin)
+    if (extras := _annotation_extras.get(origin)) is None:
+        annotations = _get_type_annotations(type_def)
+        extras = {}
+        for field in type_def.fields:
+            annotation = _get_field_annotation(origin, field.name, annotations)
+            if get_origin(annotation) is Annotated:
+                extras[field.name] = tuple(get_args(annotation)[1:])
+
+        _annotation_extras[origin] = extras
+
+    return extras
+
+
+def _get_enum_choices(enum_def: EnumDefinition) -> Tuple[FieldChoice, ...]:
+    """Return the choices for the enum.
+
+    The same choices are shared by all the fields using the enum, so those should
+    not be modified in place.
+    """
+    cached = _enum_choices.get(enum_def.wrapped_cls)
+    if cached is not None and cached[0]() is enum_def:
+        return cached[1]
+
+    choices = tuple(
+        FieldChoice(
+            label=value.description or value.name,
+            value=cast(JSON, value.name),
+        )
+        for value in enum_def.values
+    )
+    _enum_choices[enum_def.wrapped_cls] = (weakref.ref(enum_def), choices)
+    return choices
+
+
+def _get_fields_placeholder(
+    type_: Type[WithStrawberryObjectDefinition],
+    *,
+    depth: int,
+    ancestors: FrozenSet[type] = frozenset(),
+    ctx: _ResolverContext,
+) -> List[FieldOrFieldObjectData]:
+    # The resolved fields only depend on the type, how deep we can still go and
+    # its ancestors (when stopping on cycles), so the same list can be shared by
+    # every FieldObject pointing to it
+    key = (type_, ctx.max_depth - depth, ancestors)
+    if (fields := ctx.memo.get(key)) is None:
+        # The list will be filled when the pending types get resolved
+        fields = ctx.memo[key] = []
+        ctx.pending.append((type_, depth, ancestors, fields))
+
+    return fields
+
+
+def _resolve_fields_memoized(
+    type_: Type[WithStrawberryObjectDefinition],
+    *,
+    depth: int = 0,
+    ctx: _ResolverContext,
+) -> List[FieldOrFieldObjectData]:
+    fields = _get_fields_placeholder(type_, depth=depth, ctx=ctx)
+    ctx.profile = get_active_profile()
+
+    # Use a work stack instead of recursing into nested types, so that
+    # deep max_depth values are not limited by the recursion limit
+    try:
+        while ctx.pending:
+            pending_type, pending_depth, ancestors, pending_fields = ctx.pending.pop()
+            fields_iter = resolve_fields_for_type(
+                pending_type,
+                depth=pending_depth,
+                max_depth=ctx.max_depth,
+                ancestors=ancestors,
+                ctx=ctx,
+            )
+            if ctx.profile is None:
+                pending_fields.extend(fields_iter)
+            else:
+                pending_fields.extend(
+                    _profiled(
+                        ctx,
+                        "type",
+                        get_object_definition(pending_type, strict=True).name,
+                        list,
+                        fields_iter,
+                    ),
+                )
+    except BaseException:
+        # Some of the memoized lists might not have been filled
+        ctx.memo.clear()
+        ctx.pending.clear()
+        raise
+    finally:
+        ctx.profile = None
+
+    return fields
+
+
+def _profiled(
+    ctx: _ResolverContext,
+    kind: str,
+    name: str,
+    func: Callable[..., _T],
+    /,
+    *args,
+    **kwargs,
+) -> _T:
+    if ctx.profile is None:
+        return func(*args, **kwargs)
+
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        ctx.profile.record(kind, name, time.perf_counter() - start)
+
+
+def _get_field_annotation(
+    type_: Type[WithStrawberryObjectDefinition],
+    field_name: str,
+    annotations: Dict[str, Any],
+) -> Any:
+    annotation = annotations.get(field_name)
+    if isinstance(annotation, StrawberryAnnotation):
+        annotation = annotation.raw_annotation
+
+    if (
+        (annotation is None or get_origin(annotation) is not Annotated)
+        and (resolver := getattr(type_, field_name, None))
+        and hasattr(resolver, "__annotations__")
+    ):
+        annotation = resolver.__annotations__.get("return")
+    if (annotation is None or get_origin(annotation) is not Annotated) and (
+        original_annotations := _original_annotations.get(type_)
+    ):
+        annotation = original_annotations.get(field_name)
+
+    if isinstance(annotation, StrawberryAnnotation):
+        annotation = annotation.raw_annotation
+
+    return annotation
+
+
 def resolve_fields_for_type(
     type_: Type[WithStrawberryObjectDefinition],
     *,
     depth: int = 0,
     max_depth: int = DEFAULT_MAX_DEPTH,
+    cycle_policy: CyclePolicy = CyclePolicy.EXPAND,
+    ancestors: FrozenSet[type] = frozenset(),
+    ctx: Optional[_ResolverContext] = None,
 ):
-    integrations = get_all()
+    if ctx is None:
+        yield from Materializer().fields(
+            _resolve_fields_memoized(
+                type_,
+                depth=depth,
+                ctx=_ResolverContext(max_depth=max_depth, cycle_policy=cycle_policy),
+            ),
+        )
+        return
+
+    # Note that nested fields will only be filled after the pending types in
+    # the context get resolved. The fields are yielded in their compact form.
 
     type_def = get_object_definition(type_, strict=True)
+    annotation_extras = _profiled(
+        ctx,
+        "annotations",
+        type_def.name,
+        _get_annotation_extras,
+        type_def,
+    )
+    # Only keep track of the current path when we need to stop on cycles,
+    # otherwise the memoized fields could not be shared between different paths
+    path = ancestors | {type_} if ctx.cycle_policy is CyclePolicy.STOP else ancestors
 
-    annotations = {}
-    for o in reversed(type_def.origin.__mro__):
-        annotations.update(getattr(o, "__annotations__", {}))
+    # The integrations' options do not depend on the depth, so they are only
+    # computed once per type even when it gets resolved at different depths
+    if (type_fields := ctx.type_fields.get(type_)) is None:
+        type_fields = ctx.type_fields[type_] = _get_type_fields(type_, type_def, ctx)
 
-    for field in type_def.fields:
-        cname = field.graphql_name or to_camel_case(field.name)
-        hidden = False
-        options: FieldOrFieldObjectOptions = {
-            "label": field.name,
-            "validation": BaseFieldValidation(
-                required=not isinstance(field.type, StrawberryOptional),
-            ),
-        }
+    for prepared, options in type_fields:
+        field = prepared.field
+        if ctx.profile is None:
+            resolved = _resolve_field(
+                type_def,
+                prepared,
+                options,
+                annotation_extras.get(field.name, ()),
+                depth=depth,
+                max_depth=max_depth,
+                path=path,
+                ctx=ctx,
+            )
+        else:
+            resolved = _profiled(
+                ctx,
+                "field",
+                f"{type_def.name}.{field.name}",
+                _resolve_field,
+                type_def,
+                prepared,
+                options,
+                annotation_extras.get(field.name, ()),
+                depth=depth,
+                max_depth=max_depth,
+                path=path,
+                ctx=ctx,
+            )
+
+        if resolved is not None:
+            yield resolved
+
+
+class _PreparedField(NamedTuple):
+    field: StrawberryField
+    # The options found by inspecting the field's type
+    options: FieldOrFieldObjectOptions
+    resolved_type: Any
+    is_list: bool
+
+
+def _prepare_field(field: StrawberryField) -> Optional[_PreparedField]:
+    options: FieldOrFieldObjectOptions = {
+        "label": field.name,
+        "validation": BaseFieldValidation(
+            required=not isinstance(field.type, StrawberryOptional),
+        ),
+    }
+
+    f_type = field.type
+    if get_origin(f_type) is Annotated:
+        f_type, *extras = get_args(f_type)
+    else:
+        extras = []
+
+    # If this was annotated with Hidden, do not expose it in the resource
+    if any(isinstance(extra, HiddenField) for extra in extras):
+        return None
+
+    is_list: bool = False
+    while isinstance(f_type, StrawberryContainer):
+        is_list = is_list or isinstance(f_type, StrawberryList)
+        f_type = f_type.of_type
 
-        f_type = field.type
-        if get_origin(f_type) is Annotated:
-            f_type, *extras = get_args(f_type)
+    options["multiple"] = is_list
+
+    if isinstance(f_type, LazyType):
+        f_type = f_type.resolve_type()
+    if isinstance(f_type, EnumDefinition):
+        if all(isinstance(v.value, int) for v in f_type.values):
+            options["kind"] = FieldKind.INT
+        elif all(isinstance(v.value, str) for v in f_type.values):
+            options["kind"] = FieldKind.STRING
         else:
-            extras = []
+            # FIXME: Are there other possibilities other than int or string?
+            options["kind"] = FieldKind.STRING
 
-        # If this was annotated with Hidden, do not expose it in the resource
-        if any(isinstance(extra, HiddenField) for extra in extras):
-            continue
+        options["choices"] = _get_enum_choices(f_type)
+        f_type = f_type.wrapped_cls
+    if isinstance(f_type, ScalarWrapper):
+        f_type = f_type.wrap
 
-        is_list: bool = False
-        while isinstance(f_type, StrawberryContainer):
-            is_list = is_list or isinstance(f_type, StrawberryList)
-            f_type = f_type.of_type
+    if isinstance(f_type, _GenericAlias):
+        return None
 
-        options["multiple"] = is_list
+    return _PreparedField(
+        field=field,
+        options=options,
+        resolved_type=f_type,
+        is_list=is_list,
+    )
 
-        if isinstance(f_type, LazyType):
-            f_type = f_type.resolve_type()
-        if isinstance(f_type, EnumDefinition):
-            if all(isinstance(v.value, int) for v in f_type.values):
-                options["kind"] = FieldKind.INT
-            elif all(isinstance(v.value, str) for v in f_type.values):
-                options["kind"] = FieldKind.STRING
-            else:
-                # FIXME: Are there other possibilities other than int or string?
-                options["kind"] = FieldKind.STRING
 
-            options["choices"] = [
-                FieldChoice(
-                    label=value.description or value.name,
-                    value=cast(JSON, value.name),
-                )
-                for value in f_type.values
-            ]
-            f_type = f_type.wrapped_cls
-        if isinstance(f_type, ScalarWrapper):
-            f_type = f_type.wrap
+def _get_type_fields(
+    type_: Type[WithStrawberryObjectDefinition],
+    type_def: StrawberryObjectDefinition,
+    ctx: _ResolverContext,
+) -> List[Tuple[_PreparedField, FieldOrFieldObjectOptions]]:
+    prepared_fields = [
+        prepared
+        for field in type_def.fields
+        if (prepared := _prepare_field(field)) is not None
+    ]
+    # Options for each field, set to None once an integration hides the field
+    fields_options: List[Optional[FieldOrFieldObjectOptions]] = [
+        prepared.options for prepared in prepared_fields
+    ]
 
-        if isinstance(f_type, _GenericAlias):
+    for integration in ctx.integrations:
+        if integration.applies_to is not None and not integration.applies_to(type_):
             continue
 
-        type_map = field_type_map.copy()
-        for integration in integrations:
-            type_map.update(integration.get_extra_mappings())
-            try:
-                options = dict_merge(
-                    options,
-                    integration.get_field_options(
-                        type_,
-                        field,
-                        cast(type, f_type),
-                        is_list,
-                    ),
+        visible = [i for i, options in enumerate(fields_options) if options is not None]
+        if not visible:
+            break
+
+        results = _get_integration_options(
+            integration,
+            type_,
+            [prepared_fields[i] for i in visible],
+            ctx=ctx,
+        )
+        for i, result in zip(visible, results):
+            fields_options[i] = (
+                None
+                if result is None
+                else dict_merge(
+                    cast(FieldOrFieldObjectOptions, fields_options[i]), result
                 )
-            except HiddenFieldError:
-                hidden = True
-                break
+            )
 
-        if "kind" not in options and (kind := type_map.get(cast(type, f_type))):
-            options["kind"] = kind  # type: ignore
+    return [
+        (prepared, options)
+        for prepared, options in zip(prepared_fields, fields_options)
+        if options is not None
+    ]
 
-        annotation = annotations.get(field.name)
-        if isinstance(annotation, StrawberryAnnotation):
-            annotation = annotation.raw_annotation
 
-        if (
-            (annotation is None or get_origin(annotation) is not Annotated)
-            and (resolver := getattr(type_def.origin, field.name, None))
-            and hasattr(resolver, "__annotations__")
-        ):
-            annotation = resolver.__annotations__.get("return")
-        if (annotation is None or get_origin(annotation) is not Annotated) and (
-            original_annotations := _original_annotations.get(type_)
-        ):
-            annotation = original_annotations.get(field.name)
+def _get_integration_options(
+    integration: StrawberryResourceIntegration,
+    type_: Type[WithStrawberryObjectDefinition],
+    prepared_fields: List[_PreparedField],
+    *,
+    ctx: _ResolverContext,
+) -> List[Optional[FieldOrFieldObjectOptions]]:
+    if integration.get_fields_options is not None:
+        return _profiled(
+            ctx,
+            "integration",
+            f"{integration.name}.get_fields_options",
+            integration.get_fields_options,
+            type_,
+            [
+                (prepared.field, cast(type, prepared.resolved_type), prepared.is_list)
+                for prepared in prepared_fields
+            ],
+        )
+
+    results: List[Optional[FieldOrFieldObjectOptions]] = []
+    for prepared in prepared_fields:
+        try:
+            results.append(
+                _profiled(
+                    ctx,
+                    "integration",
+                    f"{integration.name}.get_field_options",
+                    integration.get_field_options,
+                    type_,
+                    prepared.field,
+                    cast(type, prepared.resolved_type),
+                    prepared.is_list,
+                ),
+            )
+        except HiddenFieldError:  # noqa: PERF203
+            results.append(None)
 
-        if isinstance(annotation, StrawberryAnnotation):
-            annotation = annotation.raw_annotation
+    return results
 
-        # Override those options with the field options
-        if get_origin(annotation) is Annotated:
-            for opt in get_args(annotation)[1:]:
-                if isinstance(opt, HiddenField):
-                    hidden = True
-                    break
 
-                if not isinstance(opt, FieldOptionsConfig):
-                    continue
+def _resolve_field(
+    type_def: StrawberryObjectDefinition,
+    prepared: _PreparedField,
+    options: FieldOrFieldObjectOptions,
+    field_extras: Tuple[Any, ...],
+    *,
+    depth: int,
+    max_depth: int,
+    path: FrozenSet[type],
+    ctx: _ResolverContext,
+) -> Optional[FieldOrFieldObjectData]:
+    field = prepared.field
+    f_type = prepared.resolved_type
+    cname = field.graphql_name or to_camel_case(field.name)
+    # The options are shared by all depths this type gets resolved at
+    options = {**options}
+
+    if "kind" not in options and (kind := ctx.kind_map.get(cast(type, f_type))):
+        options["kind"] = kind  # type: ignore
 
-                options = dict_merge(options, opt.options)
+    # Override those options with the field options
+    for opt in field_extras:
+        if isinstance(opt, HiddenField):
+            return None
 
-        if hidden:
+        if not isinstance(opt, FieldOptionsConfig):
             continue
 
-        # If this is another type, we should return a FieldObject instead
-        if "obj_kind" in options or has_object_definition(f_type):
-            if depth > max_depth:
-                continue
+        options = dict_merge(options, opt.options)
 
-            inner_type_def = get_object_definition(f_type, strict=True)
-
-            assert isinstance(f_type, type)
-            obj_kind = options.get("obj_kind")
-            if obj_kind is None:
-                obj_kind_map: Dict[Tuple[bool, bool], FieldObjectKind] = {
-                    (False, False): FieldObjectKind.OBJECT,
-                    (True, False): FieldObjectKind.OBJECT_LIST,
-                    (True, True): FieldObjectKind.INPUT_LIST,
-                    (False, True): FieldObjectKind.INPUT,
-                }
-                obj_kind = obj_kind_map[
-                    options.get("multiple", False),
-                    getattr(inner_type_def, "is_input", False),
-                ]
-
-            yield FieldObject(
-                name=cname,
-                label=options.get("label", field.name),
-                obj_kind=obj_kind,
-                obj_type=inner_type_def.name,
-                fields=list(
-                    resolve_fields_for_type(
-                        f_type, depth=depth + 1, max_depth=max_depth
-                    )
-                ),
-                resource=options.get("resource"),
-            )
-        else:
-            options = cast(FieldOptions, options)
+    # If this is another type, we should return a FieldObject instead
+    if "obj_kind" in options or has_object_definition(f_type):
+        if depth > max_depth:
+            return None
 
-            # FIXME: How to improve this?
-            if "kind" not in options:
-                continue
+        inner_type_def = get_object_definition(f_type, strict=True)
+        ctx.dependencies.setdefault(type_def.name, set()).add(inner_type_def.name)
+
+        assert isinstance(f_type, type)
+        obj_kind = options.get("obj_kind")
+        if obj_kind is None:
+            obj_kind_map: Dict[Tuple[bool, bool], FieldObjectKind] = {
+                (False, False): FieldObjectKind.OBJECT,
+                (True, False): FieldObjectKind.OBJECT_LIST,
+                (True, True): FieldObjectKind.INPUT_LIST,
+                (False, True): FieldObjectKind.INPUT,
+            }
+            obj_kind = obj_kind_map[
+                options.get("multiple", False),
+                getattr(inner_type_def, "is_input", False),
+            ]
+
+        return FieldObjectData(
+            name=cname,
+            label=options.get("label", field.name),
+            obj_kind=obj_kind,
+            obj_type=inner_type_def.name,
+            fields=(
+                # This type is already being expanded in the current path
+                []
+                if f_type in path
+                else _get_fields_placeholder(
+                    f_type,
+                    depth=depth + 1,
+                    ancestors=path,
+                    ctx=ctx,
+                )
+            ),
+            resource=options.get("resource"),
+        )
+    options = cast(FieldOptions, options)
+
+    # FIXME: How to improve this?
+    if "kind" not in options:
+        return None
+
+    if (validation := options.get("validation")) is not None:
+        options["validation"] = intern_validation(validation)
+    if (choices := options.get("choices")) is not None and not isinstance(
+        choices,
+        tuple,
+    ):
+        options["choices"] = tuple(choices)
 
-            yield Field(name=cname, **options)
+    return FieldData(
+        name=cname,
+        **options,
+        choices_key=(
+            f"{type_def.name}.{cname}" if options.get("choices") is not None else None
+        ),
+    )
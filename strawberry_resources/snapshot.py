@@ -0,0 +1,196 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import importlib
+import uuid
+from types import ModuleType
+from typing import Any, Dict, List, Set, Union
+
+from strawberry import Schema
+
+from . import resolver
+from .compact import FieldData, FieldObjectData, ResourceData
+from .storage import get_schema_fingerprint
+from .types import BaseFieldValidation, FieldChoice, FieldKind, FieldObjectKind
+
+try:
+    from django.utils.functional import Promise
+except ImportError:  # pragma:nocover
+    Promise = None
+
+
+class SnapshotMismatchError(Exception):
+    """The snapshot was not generated for the given schema."""
+
+
+class _SnapshotWriter:
+    def __init__(self):
+        self.imports: Set[str] = set()
+        # Names to import from each module
+        self.from_imports: Dict[str, Set[str]] = {}
+        self.lines: List[str] = []
+        # Fields and choices lists, as well as validations, are shared between
+        # resources, write each one only once
+        self.shared_names: Dict[int, str] = {}
+
+    def add_import(self, obj: Any) -> str:
+        cls = obj if isinstance(obj, type) else type(obj)
+        self.from_imports.setdefault(cls.__module__, set()).add(cls.__name__)
+        return cls.__name__
+
+    def render_value(self, value: Any) -> str:
+        if Promise is not None and isinstance(value, Promise):
+            # Lazy values (e.g. translations) get frozen at generation time
+            value = str(value)
+
+        if isinstance(value, (FieldKind, FieldObjectKind)):
+            return f"{self.add_import(value)}.{value.name}"
+        if isinstance(value, enum.Enum):
+            value = value.value
+
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return repr(value)
+        if isinstance(value, (FieldData, FieldObjectData, ResourceData, FieldChoice)):
+            return self.render_object(value)
+        if isinstance(value, BaseFieldValidation):
+            return self.write_shared(value, "validation")
+        if isinstance(value, tuple) and value and isinstance(value[0], FieldChoice):
+            return self.write_shared(value, "choices")
+        if (
+            isinstance(value, list)
+            and value
+            and isinstance(
+                value[0],
+                (FieldData, FieldObjectData, FieldChoice),
+            )
+        ):
+            return self.write_shared(value, "list")
+        if isinstance(value, (list, tuple)):
+            items = ", ".join(self.render_value(v) for v in value)
+            return f"[{items}]"
+        if isinstance(value, dict):
+            items = ", ".join(
+                f"{self.render_value(k)}: {self.render_value(v)}"
+                for k, v in value.items()
+            )
+            return f"{{{items}}}"
+        if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+            self.imports.add("datetime")
+            return repr(value)
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            self.imports.add(type(value).__module__)
+            return f"{type(value).__module__}.{value!r}"
+
+        raise TypeError(f"Cannot write {value!r} to a snapshot")
+
+    def render_object(self, obj: Any) -> str:
+        if isinstance(obj, tuple):
+            items = zip(obj._fields, obj)  # type: ignore
+        else:
+            items = ((f.name, getattr(obj, f.name)) for f in dataclasses.fields(obj))
+
+        kwargs = ", ".join(f"{k}={self.render_value(v)}" for k, v in items)
+        return f"{self.add_import(obj)}({kwargs})"
+
+    def write_shared(self, value: Any, kind: str) -> str:
+        if (name := self.shared_names.get(id(value))) is not None:
+            return name
+
+        # Render the value first, so that nested ones get written before this one
+        if isinstance(value, list):
+            rendered = "\n".join(
+                ["[", *(f"    {self.render_value(v)}," for v in value), "]"],
+            )
+        elif isinstance(value, tuple):
+            rendered = "\n".join(
+                ["(", *(f"    {self.render_value(v)}," for v in value), ")"],
+            )
+        else:
+            rendered = self.render_object(value)
+
+        name = self.shared_names[id(value)] = f"_{kind}_{len(self.shared_names)}"
+        self.lines.append(f"{name} = {rendered}")
+        return name
+
+
+def generate_snapshot(schema: Schema) -> str:
+    """Generate the source of a python module containing the schema's resources.
+
+    The generated module can be loaded with `load_snapshot` to avoid resolving the
+    resources at runtime.
+    """
+    writer = _SnapshotWriter()
+    resources = [
+        f"    {name!r}: {writer.render_value(resource)},"
+        for name, resource in resolver._get_compact_map(
+            schema,
+            resolver._ResolveOptions(),
+        ).items()
+    ]
+
+    header = [
+        '"""Resources snapshot generated by strawberry-resources. Do not edit."""',
+        "",
+        *(f"import {module}" for module in sorted(writer.imports)),
+        *([""] if writer.imports else []),
+        *(
+            line
+            for module, names in sorted(writer.from_imports.items())
+            for line in (
+                f"from {module} import (",
+                *(f"    {name}," for name in sorted(names)),
+                ")",
+            )
+        ),
+        "",
+        f"FINGERPRINT = {get_schema_fingerprint(schema)!r}",
+        f"STATE = {resolver.get_state_fingerprint(schema)!r}",
+        "",
+    ]
+    return "\n".join(
+        [
+            *header,
+            *writer.lines,
+            "",
+            "RESOURCES = {",
+            *resources,
+            "}",
+            "",
+        ],
+    )
+
+
+def load_snapshot(schema: Schema, module: Union[str, ModuleType]):
+    """Use the resources from a snapshot module for the given schema.
+
+    The module can be given directly or by its dotted path. A
+    `SnapshotMismatchError` will be raised if the snapshot was generated for a
+    different schema, or if the types' options or the state introspected by the
+    integrations changed.
+    """
+    if isinstance(module, str):
+        module = importlib.import_module(module)
+
+    fingerprint = get_schema_fingerprint(schema)
+    if fingerprint != module.FINGERPRINT:
+        raise SnapshotMismatchError(
+            f"The snapshot {module.__name__!r} was not generated for this schema "
+            f"(expected fingerprint {fingerprint!r}, got {module.FINGERPRINT!r}). "
+            "Generate it again by running `strawberry_resources snapshot`.",
+        )
+
+    state = resolver.get_state_fingerprint(schema)
+    if state != getattr(module, "STATE", None):
+        raise SnapshotMismatchError(
+            f"The snapshot {module.__name__!r} was generated before the types' "
+            "options or the state introspected by the integrations (e.g. django "
+            "models) changed. "
+            "Generate it again by running `strawberry_resources snapshot`.",
+        )
+
+    resources: Dict[str, ResourceData] = module.RESOURCES
+    resolver._get_schema_cache(schema).set_resource_map(
+        resolver._ResolveOptions(),
+        resources,
+    )
@@ -0,0 +1,260 @@
+import abc
+import contextlib
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import tempfile
+import weakref
+from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union, cast
+
+from strawberry import Schema
+
+from .integrations.base import get_all
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+
+    from .compact import ResourceData
+
+try:
+    _package_version = version("strawberry-resources")
+except PackageNotFoundError:  # pragma:nocover
+    _package_version = "unknown"
+
+# Bump this when the format of the stored data changes
+STORAGE_FORMAT_VERSION = 5
+
+logger = logging.getLogger(__name__)
+
+_storage: Optional["BaseStorage"] = None
+_fingerprints: Dict[Schema, str] = cast(Dict[Schema, str], weakref.WeakKeyDictionary())
+
+
+def get_schema_fingerprint(schema: Schema) -> str:
+    """Return a fingerprint identifying the resources resolved for the schema.
+
+    It is computed from the printed schema SDL, the package version and the
+    active integrations, meaning that resources resolved for a schema with the
+    same fingerprint can be reused as is.
+    """
+    if (fingerprint := _fingerprints.get(schema)) is None:
+        h = hashlib.sha256()
+        h.update(f"{STORAGE_FORMAT_VERSION}:{_package_version}\n".encode())
+        for integration in get_all():
+            h.update(f"{integration.name}:{integration.ordering}\n".encode())
+        h.update(str(schema).encode())
+        fingerprint = _fingerprints[schema] = h.hexdigest()
+
+    return fingerprint
+
+
+def _pack(
+    fingerprint: str,
+    resource_map: Dict[str, "ResourceData"],
+    state: Optional[str],
+) -> Dict[str, Any]:
+    return {
+        "version": STORAGE_FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "state": state,
+        "resources": resource_map,
+    }
+
+
+def _unpack(
+    data: Any,
+    fingerprint: str,
+    state: Optional[str],
+) -> Optional[Dict[str, "ResourceData"]]:
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != STORAGE_FORMAT_VERSION
+        or data.get("fingerprint") != fingerprint
+        or data.get("state") != state
+        or not isinstance(data.get("resources"), dict)
+    ):
+        return None
+
+    return data["resources"]
+
+
+class BaseStorage(abc.ABC):
+    """Base class for persistent storages of resolved resources."""
+
+    @abc.abstractmethod
+    def load(
+        self,
+        fingerprint: str,
+        *,
+        state: Optional[str] = None,
+    ) -> Optional[Dict[str, "ResourceData"]]:
+        """Return the resources stored for the fingerprint, or `None` on a miss.
+
+        Resources stored with a different `state` (see
+        `resolver.get_state_fingerprint`) should be treated as a miss.
+        """
+
+    @abc.abstractmethod
+    def save(
+        self,
+        fingerprint: str,
+        resource_map: Dict[str, "ResourceData"],
+        *,
+        state: Optional[str] = None,
+    ):
+        """Store the resources for the fingerprint, alongside the given `state`.
+
+        Failing to store them should not fail the resolution, errors should be
+        logged instead of raised.
+        """
+
+
+class FileStorage(BaseStorage):
+    """Store resolved resources in files inside the given directory.
+
+    Note that the data is stored using `pickle`, so the directory should only be
+    writable by trusted users.
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        self.path = pathlib.Path(path)
+
+    def _get_path(self, fingerprint: str) -> pathlib.Path:
+        return self.path / f"{fingerprint}.pickle"
+
+    def load(
+        self,
+        fingerprint: str,
+        *,
+        state: Optional[str] = None,
+    ) -> Optional[Dict[str, "ResourceData"]]:
+        path = self._get_path(fingerprint)
+
+        try:
+            with path.open("rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:  # noqa: BLE001
+            # The file is corrupted, remove it so that it gets stored again
+            with contextlib.suppress(OSError):
+                path.unlink()
+            return None
+
+        return _unpack(data, fingerprint, state)
+
+    def save(
+        self,
+        fingerprint: str,
+        resource_map: Dict[str, "ResourceData"],
+        *,
+        state: Optional[str] = None,
+    ):
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first and move it to its final location,
+            # so that concurrent readers never see a partially written file
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        except OSError:
+            logger.exception("Could not store the resources in %s", self.path)
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(
+                    _pack(fingerprint, resource_map, state),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            pathlib.Path(tmp_path).replace(self._get_path(fingerprint))
+        except Exception:
+            logger.exception("Could not store the resources in %s", self.path)
+            with contextlib.suppress(OSError):
+                pathlib.Path(tmp_path).unlink()
+        except BaseException:
+            with contextlib.suppress(OSError):
+                pathlib.Path(tmp_path).unlink()
+            raise
+
+
+class DjangoCacheStorage(BaseStorage):
+    """Store resolved resources in one of Django's caches.
+
+    This allows processes using the same cache (e.g. the workers of a node with
+    a file based cache, or all nodes with a shared one) to resolve the resources
+    only once. Entries are keyed by the schema fingerprint, so they never expire
+    unless a `timeout` is given.
+
+    Note that the data is pickled by most cache backends, so the cache should
+    only be writable by trusted users.
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        *,
+        key_prefix: str = "strawberry_resources",
+        timeout: Optional[float] = None,
+    ):
+        self.alias = alias
+        self.key_prefix = key_prefix
+        self.timeout = timeout
+
+    @property
+    def cache(self) -> "BaseCache":
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def _get_key(self, fingerprint: str) -> str:
+        return f"{self.key_prefix}:{fingerprint}"
+
+    def load(
+        self,
+        fingerprint: str,
+        *,
+        state: Optional[str] = None,
+    ) -> Optional[Dict[str, "ResourceData"]]:
+        try:
+            data = self.cache.get(self._get_key(fingerprint))
+        except Exception:  # noqa: BLE001
+            # e.g. data pickled by an incompatible version, it will be replaced
+            return None
+
+        return _unpack(data, fingerprint, state)
+
+    def save(
+        self,
+        fingerprint: str,
+        resource_map: Dict[str, "ResourceData"],
+        *,
+        state: Optional[str] = None,
+    ):
+        try:
+            self.cache.set(
+                self._get_key(fingerprint),
+                _pack(fingerprint, resource_map, state),
+                self.timeout,
+            )
+        except Exception:
+            # e.g. the cache is down or the value is too big for it
+            logger.exception(
+                "Could not store the resources in the %r cache",
+                self.alias,
+            )
+
+
+def get_storage() -> Optional[BaseStorage]:
+    return _storage
+
+
+def set_storage(storage: Optional[BaseStorage]):
+    """Set the storage used to persist resolved resources between processes.
+
+    Pass `None` to disable it.
+    """
+    global _storage  # noqa: PLW0603
+    _storage = storage
@@ -4,6 +4,7 @@ from typing import (
     Any,
     List,
     Optional,
+    Sequence,
     TypedDict,
     TypeVar,
     Union,
@@ -20,6 +21,9 @@ _R = TypeVar("_R")
 class Resource:
     name: str
     fields: List["ResourceField"] = strawberry.field(default_factory=list)
+    # Names of the resource's own fields which can be used for ordering/filtering
+    orderable_fields: List[str] = strawberry.field(default_factory=list)
+    filterable_fields: List[str] = strawberry.field(default_factory=list)
 
     def __hash__(self):
         return hash(self.name)
@@ -167,6 +171,16 @@ class FieldChoice:
     group: Optional[str] = None
 
 
+@strawberry.type
+class FieldChoicePage:
+    """A page of the choices of a field."""
+
+    choices: List[FieldChoice]
+    total_count: int = strawberry.field(
+        description="The number of choices matching the search.",
+    )
+
+
 @strawberry.type
 class Field:
     """Base field schema."""
@@ -200,6 +214,13 @@ class Field:
         description="Valid choices for this field, if any is defined.",
         default=None,
     )
+    choices_key: Optional[str] = strawberry.field(
+        description=(
+            "Set when the field has choices. Pass it to `resourceChoices` to "
+            "retrieve them in pages instead of selecting all of them in `choices`."
+        ),
+        default=None,
+    )
     default_value: Optional[JSON] = strawberry.field(
         description="Default value for the field. Parse the json to get its value.",
         default=None,
@@ -250,7 +271,7 @@ class FieldOptions(TypedDict, total=False):
     label: str
     resource: Optional[str]
     help_text: Optional[str]
-    choices: Optional[List[FieldChoice]]
+    choices: Optional[Sequence[FieldChoice]]
     default_value: Any
     validation: FieldValidation
 
@@ -1,4 +1,12 @@
-from typing import Mapping, TypeVar, Union, cast
+import dataclasses
+import enum
+from typing import Any, Mapping, TypeVar, Union, cast
+
+try:
+    from django.utils import translation
+    from django.utils.functional import Promise
+except ImportError:  # pragma:nocover
+    Promise = None
 
 _T1 = TypeVar("_T1", bound=Mapping)
 _T2 = TypeVar("_T2", bound=Mapping)
@@ -27,3 +35,43 @@ def dict_merge(dict1: _T1, dict2: _T2) -> Union[_T1, _T2]:
             new[k] = dict_merge(v1, v2)
 
     return cast(Union[_T1, _T2], new)
+
+
+def describe_value(value: Any) -> str:
+    """Describe the value in a way that is stable between processes.
+
+    Unlike `repr`, the description never includes memory addresses, and lazy
+    translations are described by their untranslated text instead of the one for
+    the active language. This is meant to be hashed into fingerprints.
+    """
+    if Promise is not None and isinstance(value, Promise):
+        with translation.override(None):
+            return repr(str(value))
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, enum.Enum):
+        return f"{_describe_qualname(type(value))}.{value.name}"
+    if isinstance(value, (list, tuple)):
+        return f"[{', '.join(describe_value(v) for v in value)}]"
+    if isinstance(value, (set, frozenset)):
+        return f"{{{', '.join(sorted(describe_value(v) for v in value))}}}"
+    if isinstance(value, dict):
+        items = (f"{describe_value(k)}: {describe_value(v)}" for k, v in value.items())
+        return f"{{{', '.join(items)}}}"
+    if isinstance(value, type) or (callable(value) and hasattr(value, "__qualname__")):
+        return _describe_qualname(value)
+    if dataclasses.is_dataclass(value):
+        fields = (
+            f"{f.name}={describe_value(getattr(value, f.name))}"
+            for f in dataclasses.fields(value)
+        )
+        return f"{_describe_qualname(type(value))}({', '.join(fields)})"
+    if type(value).__repr__ is object.__repr__:
+        # The default repr includes the object's address, describe its state instead
+        return f"{_describe_qualname(type(value))}({describe_value(getattr(value, '__dict__', {}))})"
+
+    return repr(value)
+
+
+def _describe_qualname(obj: Any) -> str:
+    return f"{getattr(obj, '__module__', None)}.{getattr(obj, '__qualname__', obj)}"
@@ -4,7 +4,7 @@ from django_choices_field import TextChoicesField
 from strawberry_django.descriptors import model_property
 from typing_extensions import Annotated
 
-from strawberry_resources.types import config
+from strawberry_resources.types import Hidden, config
 
 
 class Role(models.Model):
@@ -46,3 +46,7 @@ class Person(models.Model):
     @model_property
     def age(self) -> Annotated[int, config(label="Age")]:  # pragma: nocover
         ...
+
+    @model_property
+    def secret(self) -> Hidden[str]:  # pragma: nocover
+        ...
@@ -0,0 +1,55 @@
+import strawberry
+import strawberry_django
+from strawberry.tools import merge_types
+from typing_extensions import Annotated
+
+from strawberry_resources.queries import Query as _Query
+from strawberry_resources.types import config
+
+from .models import Person, Role
+
+
+@strawberry_django.type(Role)
+class RoleType:
+    name: strawberry.auto
+
+
+@strawberry_django.type(Person)
+class PersonType:
+    status: strawberry.auto
+    name: strawberry.auto
+    birthday: Annotated[strawberry.auto, config(label="User Birthday")]
+    age: strawberry.auto
+    role: Annotated[RoleType, config(label="Role")]
+
+
+@strawberry_django.input(Person)
+class PersonInput:
+    status: strawberry.auto
+    name: strawberry.auto
+    birthday: Annotated[strawberry.auto, config(label="User Birthday")]
+    age: strawberry.auto
+
+
+@strawberry.type
+class Query:
+    person: PersonType
+
+
+@strawberry.type
+class Mutation:
+    @strawberry_django.mutation
+    def create_person(self, input: PersonInput) -> PersonType:  # noqa: A002
+        ...
+
+
+schema = strawberry.Schema(
+    query=merge_types(
+        "Query",
+        (
+            _Query,
+            Query,
+        ),
+    ),
+    mutation=Mutation,
+)
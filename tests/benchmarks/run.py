@@ -0,0 +1,346 @@
+"""Benchmarks for the resolver, the exporter and the resources queries.
+
+Run them with:
+
+    python -m tests.benchmarks.run --output results.json
+
+And compare the results against the baseline with:
+
+    python -m tests.benchmarks.run --compare tests/benchmarks/baseline.json
+
+The process exits with status 1 when any benchmark is slower than the baseline
+by more than the given tolerance.
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import django
+import strawberry
+from strawberry.tools import merge_types
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.django_settings")
+django.setup()
+
+import strawberry_django  # noqa: E402
+
+from strawberry_resources.exporter import to_dict, to_json  # noqa: E402
+from strawberry_resources.queries import Query as ResourcesQuery  # noqa: E402
+from strawberry_resources.resolver import (  # noqa: E402
+    DEFAULT_MAX_DEPTH,
+    cache_clear,
+    get_resource_map,
+    invalidate,
+)
+from tests.app.models import Person, Role  # noqa: E402
+from tests.utils import make_schema  # noqa: E402
+
+BASELINE_VERSION = 1
+ROOT = pathlib.Path(__file__).parents[2]
+
+# Run in a new interpreter, so that nothing is imported yet
+STARTUP_CODE = """\
+import time
+
+start = time.perf_counter()
+import strawberry_resources
+imported = time.perf_counter()
+
+from strawberry_resources.integrations import get_all
+
+get_all()
+print(imported - start, time.perf_counter() - imported)
+"""
+
+RESOURCES_QUERY = """\
+query Resources {
+  resources(name: "") {
+    name
+  }
+}
+"""
+RESOURCE_QUERY = """\
+query Resource($name: String!) {
+  resource(name: $name) {
+    name
+    fields {
+      __typename
+      ... on Field {
+        name
+        kind
+        choices {
+          value
+        }
+      }
+      ... on FieldObject {
+        name
+        fields {
+          __typename
+        }
+      }
+    }
+  }
+}
+"""
+
+
+@strawberry_django.type(Role)
+class RoleType:
+    name: strawberry.auto
+
+
+@strawberry_django.type(Person)
+class PersonType:
+    status: strawberry.auto
+    name: strawberry.auto
+    birthday: strawberry.auto
+    role: RoleType
+
+
+@strawberry.type
+class DjangoQuery:
+    person: PersonType
+
+
+@dataclasses.dataclass
+class Scenario:
+    name: str
+    num_types: int
+    num_fields: int = 5
+    fan_out: int = 2
+    enum_size: int = 0
+    cycles: bool = True
+    # Add some django types to the synthetic ones
+    django: bool = False
+    max_depth: int = DEFAULT_MAX_DEPTH
+
+    def make_schema(self) -> strawberry.Schema:
+        schema = make_schema(
+            self.num_types,
+            fan_out=self.fan_out,
+            num_fields=self.num_fields,
+            enum_size=self.enum_size,
+            cycles=self.cycles,
+        )
+        queries = (ResourcesQuery, schema.query)
+        if self.django:
+            queries = (*queries, DjangoQuery)
+
+        return strawberry.Schema(query=merge_types("Query", queries))
+
+
+SCENARIOS = [
+    Scenario("small", num_types=20),
+    Scenario("wide", num_types=20, num_fields=40),
+    Scenario("fan-out", num_types=40, fan_out=4),
+    Scenario("enums", num_types=20, enum_size=200),
+    Scenario("acyclic", num_types=100, cycles=False),
+    Scenario("mixed", num_types=100, num_fields=10, django=True),
+    # Long chains of nested types, resolved with a work stack instead of recursion
+    Scenario("deep", num_types=20, num_fields=3, fan_out=1, max_depth=100),
+]
+
+
+def _time(
+    func: Callable[[], object],
+    *,
+    repeat: int,
+    setup: Optional[Callable[[], object]] = None,
+) -> Dict[str, float]:
+    timings: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {"min": min(timings), "median": statistics.median(timings)}
+
+
+def _execute(schema: strawberry.Schema, query: str, **variables):
+    result = schema.execute_sync(query, variable_values=variables)
+    assert result.errors is None, result.errors
+
+
+def run_scenario(scenario: Scenario, *, repeat: int) -> Dict[str, Dict[str, float]]:
+    schema = scenario.make_schema()
+    max_depth = scenario.max_depth
+    results = {
+        "get_resource_map (cold)": _time(
+            lambda: get_resource_map(schema, max_depth=max_depth),
+            setup=lambda: invalidate(schema),
+            repeat=repeat,
+        ),
+    }
+
+    # The remaining benchmarks use the cached resources
+    get_resource_map(schema, max_depth=max_depth)
+    results.update(
+        {
+            "get_resource_map (warm)": _time(
+                lambda: get_resource_map(schema, max_depth=max_depth),
+                repeat=repeat,
+            ),
+            "to_dict": _time(
+                lambda: to_dict(schema, max_depth=max_depth),
+                repeat=repeat,
+            ),
+            "to_json": _time(
+                lambda: to_json(schema, max_depth=max_depth),
+                repeat=repeat,
+            ),
+            "resources query": _time(
+                lambda: _execute(schema, RESOURCES_QUERY),
+                repeat=repeat,
+            ),
+            "resource query": _time(
+                lambda: _execute(schema, RESOURCE_QUERY, name="Type0"),
+                repeat=repeat,
+            ),
+        },
+    )
+    invalidate(schema)
+    return results
+
+
+def run_startup(*, repeat: int) -> Dict[str, Dict[str, float]]:
+    timings: Dict[str, List[float]] = {"import": [], "load integrations": []}
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_CODE],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+        ).stdout
+        import_time, load_time = (float(t) for t in output.split())
+        timings["import"].append(import_time)
+        timings["load integrations"].append(load_time)
+
+    return {
+        name: {"min": min(values), "median": statistics.median(values)}
+        for name, values in timings.items()
+    }
+
+
+def run(
+    scenarios: List[Scenario],
+    *,
+    repeat: int,
+    startup: bool = True,
+) -> Dict[str, Dict[str, float]]:
+    """Run the benchmarks, returning the timings keyed by `<scenario>/<benchmark>`."""
+    cache_clear()
+    results = {
+        f"{scenario.name}/{benchmark}": timing
+        for scenario in scenarios
+        for benchmark, timing in run_scenario(scenario, repeat=repeat).items()
+    }
+    if startup:
+        results.update(
+            {
+                f"startup/{benchmark}": timing
+                for benchmark, timing in run_startup(repeat=repeat).items()
+            },
+        )
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    *,
+    tolerance: float,
+) -> List[str]:
+    """Return the benchmarks which got slower than the baseline."""
+    return [
+        f"{name}: {timing['median']:.6f}s, "
+        f"baseline {baseline[name]['median']:.6f}s "
+        f"({timing['median'] / baseline[name]['median']:.2f}x)"
+        for name, timing in results.items()
+        if name in baseline
+        and timing["median"] > baseline[name]["median"] * (1 + tolerance)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[*(s.name for s in SCENARIOS), "startup"],
+        help="Only run the given scenarios",
+    )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        help="Write the results to this file (e.g. to update the baseline)",
+    )
+    parser.add_argument(
+        "--compare",
+        type=pathlib.Path,
+        help="Compare the results against this baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="How much slower than the baseline a benchmark is allowed to be",
+    )
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    results = run(
+        scenarios,
+        repeat=args.repeat,
+        startup=not args.scenario or "startup" in args.scenario,
+    )
+    for name, timing in results.items():
+        sys.stdout.write(f"{name:<40} {timing['median'] * 1000:>10.3f}ms\n")
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "version": BASELINE_VERSION,
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n",
+        )
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("version") != BASELINE_VERSION:
+            sys.stderr.write(f"Unsupported baseline version in {args.compare}\n")
+            return 1
+
+        if regressions := compare(
+            results,
+            baseline["results"],
+            tolerance=args.tolerance,
+        ):
+            sys.stderr.write("Slower than the baseline:\n")
+            sys.stderr.writelines(f"  {r}\n" for r in regressions)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+from typing import Dict, List, Tuple
+
+import pytest
+
+from strawberry_resources import resolver
+from strawberry_resources.integrations import StrawberryResourceIntegration, base
+from strawberry_resources.integrations import django as django_integration
+from tests.app.models import Person
+
+
+@pytest.fixture
+def integrations_registry(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Dict[str, StrawberryResourceIntegration]:
+    """Drop the integrations registered during the test once it finishes.
+
+    The already registered integrations are kept, the returned registry can be
+    cleared to resolve without them.
+    """
+    base.get_all()
+    monkeypatch.setattr(base, "integrations", dict(base.integrations))
+    monkeypatch.setattr(base, "_sorted_integrations", None)
+    monkeypatch.setattr(base, "_extra_mappings", None)
+    return base.integrations
+
+
+@pytest.fixture
+def resolved(monkeypatch: pytest.MonkeyPatch) -> List[Tuple[str, int]]:
+    """Record the name and the depth of each type whose fields get resolved."""
+    resolved = []
+    original = resolver.resolve_fields_for_type
+
+    def resolve_fields_for_type(type_, *, depth: int = 0, **kwargs):
+        resolved.append((type_.__name__, depth))
+        return original(type_, depth=depth, **kwargs)
+
+    monkeypatch.setattr(resolver, "resolve_fields_for_type", resolve_fields_for_type)
+    return resolved
+
+
+@pytest.fixture
+def changed_model(monkeypatch: pytest.MonkeyPatch):
+    """Change an attribute of a `Person` model field, as a migration would."""
+
+    def change(field_name: str, attr: str, value: object):
+        monkeypatch.setattr(Person._meta.get_field(field_name), attr, value)
+        django_integration.clear_model_fields_cache()
+
+    yield change
+    monkeypatch.undo()
+    django_integration.clear_model_fields_cache()
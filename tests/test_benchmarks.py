@@ -0,0 +1,60 @@
+import json
+import pathlib
+
+from .benchmarks.run import Scenario, compare, main, run
+
+
+def test_benchmarks_run():
+    # The startup benchmark spawns new interpreters, it is not run here
+    results = run(
+        [Scenario("tiny", num_types=3, enum_size=3)],
+        repeat=1,
+        startup=False,
+    )
+    assert set(results) == {
+        "tiny/get_resource_map (cold)",
+        "tiny/get_resource_map (warm)",
+        "tiny/to_dict",
+        "tiny/to_json",
+        "tiny/resources query",
+        "tiny/resource query",
+    }
+    assert all(t["min"] <= t["median"] for t in results.values())
+
+
+def test_benchmarks_compare():
+    baseline = {"a": {"min": 1.0, "median": 1.0}, "b": {"min": 1.0, "median": 1.0}}
+    results = {
+        "a": {"min": 1.1, "median": 1.1},
+        "b": {"min": 2.0, "median": 2.0},
+        "c": {"min": 5.0, "median": 5.0},
+    }
+    assert compare(results, baseline, tolerance=0.25) == [
+        "b: 2.000000s, baseline 1.000000s (2.00x)",
+    ]
+
+
+def test_benchmarks_baseline(tmp_path: pathlib.Path):
+    output = tmp_path / "results.json"
+    assert main(["--scenario", "small", "--repeat", "1", "--output", str(output)]) == 0
+
+    data = json.loads(output.read_text())
+    assert data["version"] == 1
+    assert "small/to_json" in data["results"]
+
+    # Comparing against itself with a huge tolerance should never fail
+    assert (
+        main(
+            [
+                "--scenario",
+                "small",
+                "--repeat",
+                "1",
+                "--compare",
+                str(output),
+                "--tolerance",
+                "1000",
+            ],
+        )
+        == 0
+    )
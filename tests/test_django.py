@@ -1,61 +1,35 @@
+import pytest
 import strawberry
 import strawberry_django
-from strawberry.tools import merge_types
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.utils import translation
+from django.utils.translation import gettext_lazy
+from strawberry.types import get_object_definition
 from typing_extensions import Annotated
 
-from strawberry_resources.queries import Query as _Query
-from strawberry_resources.types import config
+from strawberry_resources import resolver
+from strawberry_resources.compact import FieldData
+from strawberry_resources.integrations import django as django_integration
+from strawberry_resources.resolver import (
+    cache_clear,
+    get_resource_map,
+    refresh,
+    resolve_all,
+)
+from strawberry_resources.types import (
+    Field,
+    FieldChoice,
+    FieldKind,
+    HiddenField,
+    StringFieldValidation,
+)
 from tests.app.models import Person, Role
+from tests.app.schema import Mutation, PersonType, Query, RoleType, schema
 
 from .utils import resource_query
 
 
-@strawberry_django.type(Role)
-class RoleType:
-    name: strawberry.auto
-
-
-@strawberry_django.type(Person)
-class PersonType:
-    status: strawberry.auto
-    name: strawberry.auto
-    birthday: Annotated[strawberry.auto, config(label="User Birthday")]
-    age: strawberry.auto
-    role: Annotated[RoleType, config(label="Role")]
-
-
-@strawberry_django.input(Person)
-class PersonInput:
-    status: strawberry.auto
-    name: strawberry.auto
-    birthday: Annotated[strawberry.auto, config(label="User Birthday")]
-    age: strawberry.auto
-
-
-@strawberry.type
-class Query:
-    person: PersonType
-
-
-@strawberry.type
-class Mutation:
-    @strawberry_django.mutation
-    def create_person(self, input: PersonInput) -> PersonType:  # noqa: A002
-        ...
-
-
-schema = strawberry.Schema(
-    query=merge_types(
-        "Query",
-        (
-            _Query,
-            Query,
-        ),
-    ),
-    mutation=Mutation,
-)
-
-
 def test_query():
     res = schema.execute_sync(resource_query, {"name": "PersonType"})
     assert res.errors is None
@@ -255,3 +229,366 @@ def test_query_input_type():
             "name": "PersonInput",
         },
     }
+
+
+def test_model_fields_index(monkeypatch: pytest.MonkeyPatch):
+    fields = {f"field_{i}": models.CharField(max_length=10) for i in range(150)}
+    wide_model = type(
+        "WideModel",
+        (models.Model,),
+        {"__module__": "tests.app.models", **fields},
+    )
+
+    calls = 0
+    original = django_integration.resolve_model_field_name
+
+    def resolve_model_field_name(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(
+        django_integration,
+        "resolve_model_field_name",
+        resolve_model_field_name,
+    )
+
+    num_fields = len(wide_model._meta.get_fields())
+    for name in fields:
+        assert django_integration._get_model_field(wide_model, name) is not None
+    assert django_integration._get_model_field(wide_model, "missing") is None
+
+    # The model's fields should have been scanned only once
+    assert calls == num_fields
+
+    # Registering a model with a relation to it should invalidate its index
+    type(
+        "WideModelRelated",
+        (models.Model,),
+        {
+            "__module__": "tests.app.models",
+            "wide": models.ForeignKey(
+                wide_model,
+                on_delete=models.CASCADE,
+                related_name="related_items",
+            ),
+        },
+    )
+    assert django_integration._get_model_field(wide_model, "related_items") is not None
+
+
+def test_choices_are_shared():
+    countries = [(f"C{i}", f"Country {i}") for i in range(300)]
+    choices_model = type(
+        "ChoicesModel",
+        (models.Model,),
+        {
+            "__module__": "tests.app.models",
+            "country": models.CharField(max_length=4, choices=countries),
+            "other_country": models.CharField(max_length=4, choices=list(countries)),
+            "status": models.CharField(max_length=10, choices=Person.Status.choices),
+        },
+    )
+
+    @strawberry_django.type(choices_model)
+    class ChoicesType:
+        country: strawberry.auto
+        other_country: strawberry.auto
+        status: strawberry.auto
+
+    @strawberry.type
+    class ChoicesQuery:
+        choices: ChoicesType
+        person: PersonType
+
+    choices_schema = strawberry.Schema(query=ChoicesQuery, mutation=Mutation)
+    resource_map = resolver._get_compact_map(choices_schema, resolver._ResolveOptions())
+    country, other_country, status = resource_map["ChoicesType"].fields
+    assert isinstance(country, FieldData)
+    assert isinstance(other_country, FieldData)
+    assert isinstance(status, FieldData)
+    assert country.choices is not None
+    assert len(country.choices) == len(countries)
+    assert other_country.choices is country.choices
+
+    # The lazy labels from the same choices class are shared as well
+    assert status.choices == tuple(
+        FieldChoice(label=label, value=value) for value, label in Person.Status.choices
+    )
+    assert status.choices is django_integration._get_field_choices(
+        Person.Status.choices,
+    )
+
+    # So are the choices from the `models.Choices` enum itself
+    person_status = resource_map["PersonType"].fields[0]
+    input_status = resource_map["PersonInput"].fields[0]
+    assert isinstance(person_status, FieldData)
+    assert isinstance(input_status, FieldData)
+    assert person_status.choices is input_status.choices
+
+    # The converted fields get their own lists
+    converted = get_resource_map(choices_schema)["ChoicesType"].fields[0]
+    assert isinstance(converted, Field)
+    assert converted.choices == list(country.choices)
+    converted.choices.clear()  # type: ignore
+    assert len(country.choices) == len(countries)
+
+
+def test_choices_are_interned_by_value_type():
+    ints = django_integration._get_field_choices([(1, "Yes"), (0, "No")])
+    bools = django_integration._get_field_choices([(True, "Yes"), (False, "No")])
+    assert bools is not ints
+    assert [c.value for c in bools] == [True, False]
+    assert all(type(c.value) is bool for c in bools)
+
+
+def test_cache_clear_clears_choices():
+    choices = django_integration._get_field_choices([("a", "A"), ("b", "B")])
+    enum_choices = django_integration._get_enum_choices(Person.Status)
+    assert django_integration._field_choices
+    assert django_integration._get_enum_choices.cache_info().currsize > 0
+
+    cache_clear()
+    assert not django_integration._field_choices
+    assert django_integration._get_enum_choices.cache_info().currsize == 0
+    new_choices = django_integration._get_field_choices([("a", "A"), ("b", "B")])
+    assert new_choices is not choices
+    assert django_integration._get_enum_choices(Person.Status) is not enum_choices
+
+
+def test_applies_to(monkeypatch: pytest.MonkeyPatch):
+    calls = []
+    get_fields_options = django_integration.integration.get_fields_options
+    assert get_fields_options is not None
+
+    def counted_get_fields_options(origin, fields):
+        calls.append(origin)
+        return get_fields_options(origin, fields)
+
+    monkeypatch.setattr(
+        django_integration.integration,
+        "get_fields_options",
+        counted_get_fields_options,
+    )
+
+    @strawberry.type
+    class PlainType:
+        name: str
+        person: PersonType
+
+    @strawberry.type
+    class PlainTypeWithChoices:
+        status: Person.Status
+
+    @strawberry.type
+    class MixedQuery:
+        plain: PlainType
+        with_choices: PlainTypeWithChoices
+
+    resources = {r.name: r for r in resolve_all(strawberry.Schema(query=MixedQuery))}
+
+    # The django integration only runs for the types it applies to
+    assert set(calls) == {PersonType, RoleType, PlainTypeWithChoices}
+    with_choices = resources["PlainTypeWithChoices"].fields[0]
+    person_status = resources["PersonType"].fields[0]
+    assert isinstance(with_choices, Field)
+    assert isinstance(person_status, Field)
+    assert with_choices.choices == person_status.choices
+    assert with_choices.choices[0] is person_status.choices[0]  # type: ignore
+
+
+def test_get_fields_options():
+    type_def = get_object_definition(PersonType, strict=True)
+    fields = [
+        (prepared.field, prepared.resolved_type, prepared.is_list)
+        for f in type_def.fields
+        if (prepared := resolver._prepare_field(f)) is not None
+    ]
+    options = django_integration.get_fields_options(PersonType, fields)
+
+    # The batched hook returns the same options as the per-field one
+    assert options == [
+        django_integration.get_field_options(PersonType, *f) for f in fields
+    ]
+    assert options[3]["label"] == "Age"  # type: ignore
+
+
+def test_orderable_and_filterable_fields():
+    @strawberry_django.order(Person)
+    class PersonOrder:
+        name: strawberry.auto
+        birthday: strawberry.auto
+
+    @strawberry_django.filters.filter(Person)
+    class PersonFilter:
+        name: strawberry.auto
+
+    @strawberry_django.type(Person, order=PersonOrder, filters=PersonFilter)
+    class OrderedPersonType:
+        name: strawberry.auto
+        birthday: strawberry.auto
+        age: strawberry.auto
+
+    @strawberry_django.type(Person, order=PersonOrder)
+    class OtherPersonType:
+        name: strawberry.auto
+
+    @strawberry.type
+    class OrderedQuery:
+        person: OrderedPersonType
+        other_person: OtherPersonType
+
+    resources = get_resource_map(strawberry.Schema(query=OrderedQuery))
+    resource = resources["OrderedPersonType"]
+    assert resource.orderable_fields == ["name", "birthday"]
+    assert resource.filterable_fields == ["name"]
+    assert [f.name for f in resource.fields if getattr(f, "orderable", False)] == [
+        "name",
+        "birthday",
+    ]
+    assert resources["OtherPersonType"].orderable_fields == ["name"]
+    assert resources["OtherPersonType"].filterable_fields == []
+
+    # The names are cached per order type, which is shared by both types
+    assert django_integration._get_field_names(PersonOrder) == {"name", "birthday"}
+
+
+@pytest.mark.parametrize(
+    ("field_cls", "kind"),
+    [
+        (models.ImageField, FieldKind.IMAGE),
+        (models.FileField, FieldKind.FILE),
+        (models.EmailField, FieldKind.EMAIL),
+        (models.BigAutoField, FieldKind.ID),
+        (models.SmallAutoField, FieldKind.ID),
+        (models.BigIntegerField, FieldKind.INT),
+        (models.DateTimeField, FieldKind.DATETIME),
+        (models.OneToOneField, FieldKind.ID),
+        (models.OneToOneRel, FieldKind.ID),
+    ],
+)
+def test_field_kinds(field_cls: type, kind: FieldKind):
+    assert django_integration._get_field_kind(field_cls) is kind
+
+
+def test_register_field_kind(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        django_integration,
+        "_field_kinds",
+        dict(django_integration._field_kinds),
+    )
+    monkeypatch.setattr(django_integration, "_field_kinds_cache", {})
+
+    class ColorField(models.CharField):
+        pass
+
+    class DarkColorField(ColorField):
+        pass
+
+    # Handled as their closest registered base until registered themselves
+    char_options = django_integration._char_field_options
+    assert django_integration._get_field_kind(models.URLField) is char_options
+    assert django_integration._get_field_kind(DarkColorField) is char_options
+
+    django_integration.register_field_kind(ColorField, FieldKind.STRING)
+    assert django_integration._get_field_kind(DarkColorField) is FieldKind.STRING
+
+    django_integration.register_field_kind(
+        DarkColorField,
+        lambda dj_field, field: {"kind": FieldKind.JSON, "help_text": "dark"},
+    )
+    handler = django_integration._get_field_kind(DarkColorField)
+    assert callable(handler)
+    assert handler(DarkColorField(), None) == {  # type: ignore
+        "kind": FieldKind.JSON,
+        "help_text": "dark",
+    }
+
+
+@pytest.mark.parametrize("mode", ["blocking", "background"])
+def test_warm_up_schemas(settings, mode: str):
+    import strawberry_resources
+    from strawberry_resources import apps, resolver
+
+    resolver.cache_clear()
+    settings.STRAWBERRY_RESOURCES_SCHEMAS = ["tests.app.schema.schema"]
+    settings.STRAWBERRY_RESOURCES_WARM_UP = mode
+
+    apps.StrawberryResourcesConfig(
+        "strawberry_resources",
+        strawberry_resources,
+    ).ready()
+
+    # The request will wait for the warm up when running in the background
+    get_resource_map(schema)
+    assert resolver.cache_info().misses == 1
+    resolver.cache_clear()
+
+
+def test_warm_up_schemas_invalid_mode(settings):
+    from strawberry_resources import apps
+
+    settings.STRAWBERRY_RESOURCES_WARM_UP = "later"
+    with pytest.raises(ImproperlyConfigured):
+        apps.warm_up_schemas()
+
+
+@pytest.mark.parametrize(
+    ("field_name", "attr", "value"),
+    [
+        ("name", "max_length", 100),
+        ("name", "verbose_name", "Full name"),
+        ("status", "choices", [("ACTIVE", "Active")]),
+        ("birthday", "null", False),
+    ],
+)
+def test_model_fingerprint(changed_model, field_name: str, attr: str, value: object):
+    fingerprint = django_integration.get_model_fingerprint(Person)
+    # Cached, and stable when nothing changed
+    assert django_integration.get_model_fingerprint(Person) is fingerprint
+    django_integration.clear_model_fields_cache()
+    assert django_integration.get_model_fingerprint(Person) == fingerprint
+
+    changed_model(field_name, attr, value)
+    assert django_integration.get_model_fingerprint(Person) != fingerprint
+    assert django_integration.get_model_fingerprint(Role) is not None
+
+
+def test_model_fingerprint_is_deterministic(
+    changed_model,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    changed_model("name", "verbose_name", gettext_lazy("Yes"))
+    with translation.override("en"):
+        fingerprint = django_integration.get_model_fingerprint(Person)
+
+    # Lazy translations are described by their untranslated text
+    django_integration.clear_model_fields_cache()
+    with translation.override("pt-br"):
+        assert str(gettext_lazy("Yes")) == "Sim"
+        assert django_integration.get_model_fingerprint(Person) == fingerprint
+
+    # Annotated options are described by their contents, not by their identity
+    monkeypatch.setitem(
+        Person.secret.func.__annotations__,
+        "return",
+        Annotated[str, HiddenField()],
+    )
+    django_integration.clear_model_fields_cache()
+    assert django_integration.get_model_fingerprint(Person) == fingerprint
+
+
+def test_refresh_model_changed_in_place(changed_model):
+    cache_clear()
+    previous = strawberry.Schema(query=Query)
+    resource_map = get_resource_map(previous)
+
+    # Both schemas share the same types, only the model changed
+    changed_model("name", "max_length", 100)
+    new_resource_map = refresh(strawberry.Schema(query=Query), previous)
+
+    name = new_resource_map["PersonType"].fields[1]
+    assert isinstance(name, Field)
+    assert isinstance(name.validation, StringFieldValidation)
+    assert name.validation.max_length == 100  # noqa: PLR2004
+    assert new_resource_map["RoleType"] is resource_map["RoleType"]
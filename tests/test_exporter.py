@@ -9,8 +9,11 @@ import pytest
 import strawberry
 from strawberry.tools import merge_types
 
-from strawberry_resources.exporter import to_json
+from strawberry_resources.exporter import to_dict, to_json
 from strawberry_resources.queries import Query as _Query
+from strawberry_resources.resolver import CyclePolicy
+
+from .utils import make_schema
 
 
 def _check_json(name: str, result: str):
@@ -77,3 +80,55 @@ def test_to_json(config: Tuple[str, bool, bool]):
             sort_keys=True,
         ),
     )
+
+
+def test_to_json_cycle_policy():
+    schema = make_schema(4, fan_out=2)
+
+    expanded = to_json(schema, max_depth=3)
+    stopped = to_json(schema, max_depth=3, cycle_policy=CyclePolicy.STOP)
+    assert len(stopped) < len(expanded)
+    assert len(to_json(schema, max_depth=1)) < len(expanded)
+
+
+def test_to_dict_deep_max_depth():
+    schema = make_schema(2, fan_out=1)
+
+    # This would exceed the recursion limit if exported recursively
+    max_depth = 1000
+    fields = to_dict(schema, max_depth=max_depth)["Type0"]["fields"]
+    depth = 0
+    while "link1" in fields:
+        assert fields["link1"]["objType"] == f"Type{(depth + 1) % 2}"
+        fields = fields["link1"]["fields"]
+        depth += 1
+
+    assert depth == max_depth + 1
+
+    with pytest.raises(ValueError, match="nested too deep"):
+        to_json(schema, max_depth=max_depth)
+
+
+def test_choices_by_reference():
+    @strawberry.enum
+    class SomeEnum(enum.Enum):
+        FOO = "foo"
+        BAR = "bar"
+
+    @strawberry.type
+    class Query:
+        name: str
+        some_enum: SomeEnum
+
+    schema = strawberry.Schema(query=Query)
+
+    fields = to_dict(schema)["Query"]["fields"]
+    assert "choicesKey" not in fields["someEnum"]
+    assert len(fields["someEnum"]["choices"]) == 2  # noqa: PLR2004
+
+    fields = to_dict(schema, choices_by_reference=True)["Query"]["fields"]
+    assert "choices" not in fields["someEnum"]
+    assert fields["someEnum"]["choicesKey"] == "Query.someEnum"
+    # Fields without choices keep their (empty) choices
+    assert fields["name"]["choices"] is None
+    assert "choicesKey" not in fields["name"]
@@ -0,0 +1,103 @@
+import dataclasses
+import sys
+from typing import Callable
+
+import pytest
+
+import strawberry_resources.integrations
+from strawberry_resources.integrations import (
+    StrawberryResourceIntegration,
+    base,
+    get_all,
+    get_extra_mappings,
+    register,
+)
+
+
+@dataclasses.dataclass
+class _EntryPoint:
+    load: Callable[[], object]
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(base, "_integrations_loaded", False)
+    monkeypatch.setattr(base, "integrations", {})
+    monkeypatch.setattr(base, "_sorted_integrations", None)
+    monkeypatch.setattr(base, "_extra_mappings", None)
+    monkeypatch.setattr(base, "_iter_entry_points", list)
+    monkeypatch.setattr(base, "_pending_builtin_integrations", [])
+
+
+def _make_integration(name: str, ordering: int = 0):
+    return StrawberryResourceIntegration(
+        name=name,
+        get_extra_mappings=dict,
+        get_field_options=lambda *args: {},
+        ordering=ordering,
+    )
+
+
+def test_get_all_loads_builtin_integrations(monkeypatch: pytest.MonkeyPatch):
+    # Make sure the django integration gets imported again
+    module_name = "strawberry_resources.integrations.django"
+    monkeypatch.delitem(sys.modules, module_name, raising=False)
+    monkeypatch.setattr(
+        strawberry_resources.integrations, "django", None, raising=False
+    )
+    monkeypatch.setattr(
+        base,
+        "builtin_integrations",
+        {
+            module_name: "strawberry_django",
+            # Integrations whose dependencies are missing should be skipped
+            "strawberry_resources.integrations.missing": "sys",
+            # Only imported once its dependency gets imported
+            "tests.app.models": "_not_imported_yet",
+        },
+    )
+
+    assert [i.name for i in get_all()] == ["django"]
+    assert sys.modules[module_name].integration is base.integrations["django"]
+    assert base._pending_builtin_integrations == ["tests.app.models"]
+
+    monkeypatch.setitem(sys.modules, "_not_imported_yet", sys)
+    get_all()
+    assert base._pending_builtin_integrations == []
+
+
+def test_get_all_loads_entry_points(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(base, "builtin_integrations", {})
+    monkeypatch.setattr(
+        base,
+        "_iter_entry_points",
+        lambda: [
+            _EntryPoint(load=lambda: _make_integration("after", ordering=1)),
+            _EntryPoint(load=lambda: _make_integration("before", ordering=-1)),
+            # A module, whose integrations registered themselves when imported
+            _EntryPoint(load=lambda: _make_integration("module") and sys),
+        ],
+    )
+
+    assert [i.name for i in get_all()] == ["before", "module", "after"]
+
+
+def test_get_all_is_cached(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(base, "builtin_integrations", {})
+    first = _make_integration("first")
+
+    integrations = get_all()
+    assert integrations == [first]
+    assert get_all() is integrations
+    mappings = get_extra_mappings()
+    assert get_extra_mappings() is mappings
+
+    # Registering a new integration invalidates the cache
+    second = dataclasses.replace(first, name="second", ordering=-1)
+    assert get_all() == [second, first]
+    assert get_extra_mappings() is not mappings
+
+    integrations = get_all()
+    register(dataclasses.replace(second, ordering=1))
+    assert get_all() is not integrations
+    assert [i.name for i in get_all()] == ["first", "second"]
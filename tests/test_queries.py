@@ -3,10 +3,12 @@ import decimal
 import enum
 from typing import Optional
 
+import pytest
 import strawberry
 from strawberry.tools import merge_types
 from typing_extensions import Annotated
 
+from strawberry_resources import queries
 from strawberry_resources.queries import Query as _Query
 from strawberry_resources.types import (
     DecimalFieldValidation,
@@ -336,3 +338,107 @@ def test_query_with_annotations():
             "name": "SomeType",
         },
     }
+
+
+CHOICES_QUERY = """\
+query ResourceChoices(
+  $resource: String!
+  $field: String!
+  $search: String
+  $offset: Int! = 0
+  $limit: Int! = 100
+) {
+  resource(name: $resource) {
+    fields {
+      ... on Field {
+        name
+        choicesKey
+      }
+    }
+  }
+  resourceChoices(
+    resource: $resource
+    field: $field
+    search: $search
+    offset: $offset
+    limit: $limit
+  ) {
+    totalCount
+    choices {
+      label
+      value
+    }
+  }
+}
+"""
+
+
+def test_resource_choices(monkeypatch: pytest.MonkeyPatch):
+    Country = enum.Enum(  # noqa: N806
+        "Country",
+        {
+            f"COUNTRY_{i}": f"{name} {i}"
+            for i, name in enumerate(["Brazil", "Bolivia", "Chile"] * 100)
+        },
+    )
+    CountryEnum = strawberry.enum(Country)  # noqa: N806
+
+    @strawberry.type
+    class SomeType:
+        name: str
+        country: CountryEnum  # type: ignore
+
+    @strawberry.type
+    class Query:
+        some_type: SomeType
+
+    schema = strawberry.Schema(query=merge_types("Query", (_Query, Query)))
+
+    def execute(**variables):
+        res = schema.execute_sync(
+            CHOICES_QUERY,
+            {"resource": "SomeType", "field": "country", **variables},
+        )
+        assert res.errors is None
+        assert res.data is not None
+        return res.data
+
+    data = execute(limit=2)
+    # Only fields with choices have a key
+    assert data["resource"]["fields"] == [
+        {"name": "name", "choicesKey": None},
+        {"name": "country", "choicesKey": "SomeType.country"},
+    ]
+    assert data["resourceChoices"] == {
+        "totalCount": 300,
+        "choices": [
+            {"label": "COUNTRY_0", "value": "COUNTRY_0"},
+            {"label": "COUNTRY_1", "value": "COUNTRY_1"},
+        ],
+    }
+
+    # Searching by the prefix of the label, case insensitive, in the same order
+    # as the choices were defined
+    data = execute(search="country_1", offset=1, limit=3)
+    assert data["resourceChoices"] == {
+        "totalCount": 111,
+        "choices": [
+            {"label": "COUNTRY_10", "value": "COUNTRY_10"},
+            {"label": "COUNTRY_11", "value": "COUNTRY_11"},
+            {"label": "COUNTRY_12", "value": "COUNTRY_12"},
+        ],
+    }
+    assert execute(search="country_299")["resourceChoices"]["totalCount"] == 1
+    assert execute(search="nothing")["resourceChoices"] == {
+        "totalCount": 0,
+        "choices": [],
+    }
+    # The page size is limited
+    monkeypatch.setattr(queries, "MAX_CHOICES_PAGE_SIZE", 5)
+    assert len(execute(limit=1000)["resourceChoices"]["choices"]) == 5  # noqa: PLR2004
+    assert execute(offset=299, limit=10)["resourceChoices"]["choices"] == [
+        {"label": "COUNTRY_299", "value": "COUNTRY_299"},
+    ]
+
+    assert execute(field="name")["resourceChoices"] is None
+    assert execute(resource="Missing")["resourceChoices"] is None
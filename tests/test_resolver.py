@@ -1,10 +1,36 @@
+import asyncio
 import datetime
 import decimal
+import enum
+import gc
+import threading
+import time
+import weakref
+from typing import List, NewType
 
+import pytest
 import strawberry
 from typing_extensions import Annotated
 
-from strawberry_resources.resolver import get_resource_by_name
+from strawberry_resources import resolver
+from strawberry_resources.compact import FieldData, FieldObjectData
+from strawberry_resources.integrations import StrawberryResourceIntegration
+from strawberry_resources.profiling import profile
+from strawberry_resources.resolver import (
+    CyclePolicy,
+    aget_resource_map,
+    cache_clear,
+    cache_info,
+    get_kind_map,
+    get_resource_by_name,
+    get_resource_map,
+    invalidate,
+    refresh,
+    resolve_all,
+    resolve_fields_for_type,
+    warm,
+    warm_in_background,
+)
 from strawberry_resources.types import (
     DecimalFieldValidation,
     Field,
@@ -16,6 +42,8 @@ from strawberry_resources.types import (
     config,
 )
 
+from .utils import make_schema
+
 
 def test_resource():
     @strawberry.type
@@ -157,3 +185,618 @@ def test_resourcea_with_annotations():
             ),
         ],
     )
+
+
+@pytest.mark.parametrize("num_types", [10, 50, 250])
+def test_resolve_all_scales_linearly(resolved: list, num_types: int):
+    schema = make_schema(num_types, fan_out=3)
+    resources = {r.name: r for r in resolve_all(schema)}
+
+    # Each type gets resolved at most once per remaining depth (2, 1, 0 and -1),
+    # no matter how many other types reference it
+    assert len(resolved) <= (num_types + 1) * 4
+
+    # Nested fields for the same type and depth are shared
+    type0 = resources["Type0"]
+    type1 = resources["Type1"]
+    assert type0.fields[3].fields is type1.fields[2].fields
+
+
+def test_get_resource_by_name_is_lazy(resolved: list):
+    schema = make_schema(100, fan_out=1)
+
+    resource = get_resource_by_name(schema, "Type0")
+    assert resource is not None
+    # Only Type0 and the types reachable from it should have been resolved
+    assert resolved == [("Type0", 0), ("Type1", 1), ("Type2", 2), ("Type3", 3)]
+    assert get_resource_by_name(schema, "Type0") is resource
+    assert get_resource_by_name(schema, "Missing") is None
+
+    resolved.clear()
+    resource_map = get_resource_map(schema)
+    assert resource_map["Type0"] is resource
+    assert ("Type0", 0) not in resolved
+    assert list(resource_map) == [r.name for r in resolve_all(schema)]
+
+
+def test_integration_extra_mappings(integrations_registry: dict):
+    Money = NewType("Money", str)
+    MoneyScalar = strawberry.scalar(Money, serialize=str, parse_value=str)  # noqa: N806
+    calls = 0
+
+    def get_extra_mappings():
+        nonlocal calls
+        calls += 1
+        return {Money: FieldKind.CURRENCY}
+
+    assert Money not in get_kind_map()
+    StrawberryResourceIntegration(
+        name="money",
+        get_extra_mappings=get_extra_mappings,
+        get_field_options=lambda *args: {},
+    )
+    # Registering an integration should invalidate the cached mappings
+    assert get_kind_map()[Money] == FieldKind.CURRENCY
+
+    @strawberry.type
+    class SomeType:
+        price: MoneyScalar  # type: ignore
+        other_price: MoneyScalar  # type: ignore
+
+    @strawberry.type
+    class Query:
+        some_type: SomeType
+
+    schema = strawberry.Schema(query=Query)
+    resources = {r.name: r for r in resolve_all(schema)}
+    assert [f.kind for f in resources["SomeType"].fields] == [  # type: ignore
+        FieldKind.CURRENCY,
+        FieldKind.CURRENCY,
+    ]
+    # The mappings should not be retrieved again for each field
+    assert calls == 1
+
+
+def test_cache():
+    cache_clear()
+    schema = make_schema(10)
+
+    resource_map = warm(schema)
+    assert cache_info() == (0, 1, 1)
+    assert get_resource_map(schema) is resource_map
+    assert get_resource_by_name(schema, "Type0") is resource_map["Type0"]
+    assert cache_info() == (2, 1, 1)
+
+    invalidate(schema)
+    assert cache_info().schemas == 0
+    new_resource_map = get_resource_map(schema)
+    assert new_resource_map is not resource_map
+    assert new_resource_map == resource_map
+    assert cache_info() == (2, 2, 1)
+
+
+def test_cache_does_not_keep_converted_resources():
+    cache_clear()
+    schema = make_schema(10)
+    resource_map = get_resource_map(schema)
+    # Lookups reuse the converted resources while those are still referenced
+    assert get_resource_map(schema) is resource_map
+    assert get_resource_by_name(schema, "Type0") is resource_map["Type0"]
+
+    resource_ref = weakref.ref(resource_map["Type0"])
+    del resource_map
+    gc.collect()
+    # Only the compact data stays cached
+    assert resource_ref() is None
+    assert get_resource_map(schema)["Type0"] == get_resource_by_name(schema, "Type0")
+
+
+def test_cache_does_not_keep_schemas_alive():
+    cache_clear()
+    schema = make_schema(10)
+    get_resource_by_name(schema, "Type0")
+    ref = weakref.ref(schema)
+    resource_ref = weakref.ref(get_resource_map(schema)["Type0"])
+    assert cache_info().schemas == 1
+
+    del schema
+    gc.collect()
+
+    assert ref() is None
+    assert resource_ref() is None
+    assert cache_info().schemas == 0
+
+
+def test_refresh(resolved: list):
+    cache_clear()
+    schema = make_schema(300, fan_out=1)
+    resource_map = get_resource_map(schema)
+
+    new_schema = make_schema(300, fan_out=1, extra_fields={"Type150": {"extra": int}})
+    resolved.clear()
+    new_resource_map = refresh(new_schema, schema)
+
+    # Only the changed type and the ones embedding it should have been resolved
+    assert sorted(name for name, depth in resolved if depth == 0) == [
+        "Query",
+        "Type147",
+        "Type148",
+        "Type149",
+        "Type150",
+    ]
+    assert new_resource_map["Type0"] is resource_map["Type0"]
+    assert new_resource_map["Type150"] != resource_map["Type150"]
+    assert new_resource_map == {r.name: r for r in resolve_all(new_schema)}
+
+    # Nothing changed, so nothing should be resolved again
+    resolved.clear()
+    assert refresh(make_schema(300, fan_out=1), schema) == resource_map
+    assert resolved == []
+
+
+def test_resolve_deep_max_depth():
+    schema = make_schema(10, fan_out=1)
+    type0 = schema.get_type_by_name("Type0")
+    assert type0 is not None
+
+    # This would exceed the recursion limit if resolved recursively
+    max_depth = 5000
+    fields = list(resolve_fields_for_type(type0.origin, max_depth=max_depth))  # type: ignore
+
+    depth = 0
+    while nested := [f for f in fields if isinstance(f, FieldObject)]:
+        assert nested[0].obj_type == f"Type{(depth + 1) % 10}"
+        fields = nested[0].fields
+        depth += 1
+
+    assert depth == max_depth + 1
+
+
+@strawberry.type
+class User:
+    name: str
+    team: "Team"
+
+
+@strawberry.type
+class Team:
+    name: str
+    users: List[User]
+
+
+def test_cycle_policy():
+    @strawberry.type
+    class Query:
+        user: User
+
+    schema = strawberry.Schema(query=Query)
+    expanded = get_resource_by_name(schema, "User")
+    stopped = get_resource_by_name(schema, "User", cycle_policy=CyclePolicy.STOP)
+    assert expanded is not None
+    assert stopped is not None
+
+    name = Field(name="name", kind=FieldKind.STRING, label="name")
+    assert stopped == Resource(
+        name="User",
+        fields=[
+            name,
+            FieldObject(
+                name="team",
+                label="team",
+                obj_kind=FieldObjectKind.OBJECT,
+                obj_type="Team",
+                fields=[
+                    name,
+                    FieldObject(
+                        name="users",
+                        label="users",
+                        obj_kind=FieldObjectKind.OBJECT_LIST,
+                        obj_type="User",
+                        fields=[],
+                    ),
+                ],
+            ),
+        ],
+    )
+
+    # The default policy keeps expanding until max_depth is reached
+    users = expanded.fields[1].fields[1]  # type: ignore
+    assert isinstance(users, FieldObject)
+    assert users.fields != []
+
+    # Each setting has its own cache entry
+    assert get_resource_map(schema)["User"] is expanded
+    assert get_resource_map(schema, cycle_policy=CyclePolicy.STOP)["User"] is stopped
+    deeper = get_resource_map(schema, max_depth=4)["User"]
+    assert deeper != expanded
+
+
+def test_annotations_are_cached_per_type(monkeypatch: pytest.MonkeyPatch):
+    schema = make_schema(50, fan_out=3)
+
+    merged = []
+    original = resolver._get_type_annotations
+
+    def get_type_annotations(type_def):
+        merged.append(type_def.name)
+        return original(type_def)
+
+    monkeypatch.setattr(resolver, "_get_type_annotations", get_type_annotations)
+
+    # Each type is resolved multiple times as a nested object, with different
+    # settings, but its annotations get merged only once
+    list(resolve_all(schema))
+    list(resolve_all(schema, max_depth=4))
+    list(resolve_all(schema, cycle_policy=CyclePolicy.STOP))
+    assert sorted(merged) == sorted(r.name for r in resolve_all(schema))
+
+
+def test_annotations_cache_type_redefined():
+    class Base:
+        name: Annotated[str, config(label="Base name")]
+
+    schema = strawberry.Schema(query=strawberry.type(Base))
+    assert get_resource_by_name(schema, "Base").fields[0].label == "Base name"  # type: ignore
+
+    # Redecorating the class must not reuse the annotations cached for it
+    Base.__annotations__["name"] = Annotated[str, config(label="New name")]
+    schema = strawberry.Schema(query=strawberry.type(Base))
+    assert get_resource_by_name(schema, "Base").fields[0].label == "New name"  # type: ignore
+
+
+@strawberry.enum
+class Country(enum.Enum):
+    locals().update({f"C{i}": f"c{i}" for i in range(300)})
+
+
+def test_enum_choices_are_shared():
+    num_types = 20
+    schema = make_schema(
+        num_types,
+        extra_fields={f"Type{i}": {"country": Country} for i in range(num_types)},
+    )
+
+    resource_map = resolver._get_compact_map(schema, resolver._ResolveOptions())
+    choices = [
+        f.choices
+        for r in resource_map.values()
+        for f in r.fields
+        if isinstance(f, FieldData) and f.name == "country"
+    ]
+    assert len(choices) == num_types
+    assert len(choices[0]) == len(Country)  # type: ignore
+    assert all(c is choices[0] for c in choices)
+
+    # Nested fields use them too
+    link1 = resource_map["Type0"].fields[2]
+    assert isinstance(link1, FieldObjectData)
+    country = next(f for f in link1.fields if f.name == "country")
+    assert isinstance(country, FieldData)
+    assert country.choices is choices[0]
+
+    # Each converted field gets its own list of the shared choices
+    converted = [
+        f.choices
+        for r in resolve_all(schema)
+        for f in r.fields
+        if isinstance(f, Field) and f.name == "country"
+    ]
+    assert converted[0] == list(choices[0])  # type: ignore
+    assert converted[0] is not converted[1]
+    assert converted[0][0] is converted[1][0]  # type: ignore
+
+
+def test_enum_choices_do_not_keep_enums_alive():
+    @strawberry.enum
+    class Color(enum.Enum):
+        RED = "red"
+        BLUE = "blue"
+
+    enum_def = Color._enum_definition  # type: ignore
+    assert resolver._get_enum_choices(enum_def) is resolver._get_enum_choices(enum_def)
+    ref = weakref.ref(Color)
+    assert ref in {weakref.ref(k) for k in resolver._enum_choices}
+
+    del Color, enum_def
+    gc.collect()
+    assert ref() is None
+
+
+def test_profile(integrations_registry: dict):
+    schema = make_schema(5, num_fields=1)
+    integrations_registry.clear()
+
+    hook_calls = []
+    StrawberryResourceIntegration(
+        name="counter",
+        get_extra_mappings=dict,
+        get_field_options=lambda *args: hook_calls.append(args) or {},
+    )
+
+    recorded = []
+    with profile(callback=lambda *args: recorded.append(args)) as p:
+        resources = list(resolve_all(schema))
+
+    assert p.entries["integration", "counter.get_field_options"].calls == len(
+        hook_calls,
+    )
+    assert p.entries["field", "Type0.field0"].calls == 4  # noqa: PLR2004
+    assert p.entries["type", "Type0"].calls == 4  # noqa: PLR2004
+    assert {k for k, _ in p.entries} == {"type", "field", "annotations", "integration"}
+    assert len(recorded) == sum(e.calls for e in p.entries.values())
+    assert all(e.time >= 0 for e in p.entries.values())
+
+    # The top entries are sorted by time
+    top = p.top(3)
+    assert len(top) == 3  # noqa: PLR2004
+    assert top[0].time >= top[1].time >= top[2].time
+    assert p.top(1, kind="type")[0].kind == "type"
+    assert "counter.get_field_options" in p.format(100)
+
+    # Nothing gets recorded outside of the block
+    entries = dict(p.entries)
+    assert list(resolve_all(schema)) == resources
+    assert p.entries == entries
+
+
+async def test_profile_is_scoped():
+    cache_clear()
+    schema = make_schema(20, num_fields=1)
+    with profile() as p:
+        get_resource_by_name(schema, "Type0")
+
+    calls = {key: e.calls for key, e in p.entries.items()}
+    assert calls
+    # Resources resolved on demand after the block reuse the resolution context,
+    # but not its profile
+    get_resource_by_name(schema, "Type10")
+    assert {key: e.calls for key, e in p.entries.items()} == calls
+
+    # Resolutions in other threads are not recorded either
+    with profile() as p:
+        thread = threading.Thread(target=get_resource_map, args=(make_schema(5),))
+        thread.start()
+        thread.join()
+    assert p.entries == {}
+
+    # While async resolutions are, even though they run in a thread
+    with profile() as p:
+        await aget_resource_map(make_schema(5))
+    assert p.entries
+
+
+def test_integration_applies_to(integrations_registry: dict):
+    checked = []
+    hook_calls = []
+
+    def applies_to(origin):
+        checked.append(origin.__name__)
+        return origin.__name__ == "Type0"
+
+    StrawberryResourceIntegration(
+        name="only_type0",
+        get_extra_mappings=dict,
+        get_field_options=lambda origin, *args: hook_calls.append(origin.__name__)
+        or {"help_text": "Type0 field"},
+        applies_to=applies_to,
+    )
+
+    schema = make_schema(10)
+    resources = {r.name: r for r in resolve_all(schema)}
+
+    # Evaluated once per type, even though types are resolved at multiple depths
+    assert sorted(checked) == sorted(set(checked))
+    assert set(hook_calls) == {"Type0"}
+    assert all(
+        f.help_text == "Type0 field"
+        for f in resources["Type0"].fields
+        if isinstance(f, Field)
+    )
+    assert all(
+        f.help_text is None for f in resources["Type1"].fields if isinstance(f, Field)
+    )
+
+
+def test_integration_get_fields_options(integrations_registry: dict):
+    batches = []
+
+    def get_fields_options(origin, fields):
+        batches.append((origin.__name__, [f.name for f, _, _ in fields]))
+        # Hide the first field of each type
+        return [None, *({"help_text": origin.__name__} for _ in fields[1:])]
+
+    def get_field_options(*args):
+        raise AssertionError("The batched hook should be used instead")
+
+    StrawberryResourceIntegration(
+        name="batched",
+        get_extra_mappings=dict,
+        get_field_options=get_field_options,
+        get_fields_options=get_fields_options,
+    )
+
+    schema = make_schema(10)
+    resources = {r.name: r for r in resolve_all(schema)}
+
+    # Called once per type with all its fields, even though types are resolved
+    # at multiple depths
+    names = [name for name, _ in batches]
+    assert sorted(names) == sorted(set(names))
+    # The hidden field is not in the resource
+    type0_fields = dict(batches)["Type0"]
+    assert len(resources["Type0"].fields) == len(type0_fields) - 1
+    assert all(
+        f.help_text == "Type0"
+        for f in resources["Type0"].fields
+        if isinstance(f, Field)
+    )
+
+
+def test_warm_in_background(monkeypatch: pytest.MonkeyPatch):
+    cache_clear()
+    schema = make_schema(10)
+    release = threading.Event()
+    builds = []
+    build_resource_map = resolver._build_resource_map
+
+    def slow_build_resource_map(*args, **kwargs):
+        builds.append(args)
+        release.wait()
+        return build_resource_map(*args, **kwargs)
+
+    monkeypatch.setattr(resolver, "_build_resource_map", slow_build_resource_map)
+
+    thread = warm_in_background(schema)
+    # Warming up the same schema again reuses the running thread
+    assert warm_in_background(schema) is thread
+
+    results = []
+    requests = [
+        threading.Thread(target=lambda: results.append(get_resource_map(schema))),
+        threading.Thread(
+            target=lambda: results.append(get_resource_by_name(schema, "Type0")),
+        ),
+    ]
+    for request in requests:
+        request.start()
+
+    # The requests wait for the warm up instead of resolving the resources
+    time.sleep(0.05)
+    assert results == []
+
+    release.set()
+    thread.join()
+    for request in requests:
+        request.join()
+
+    assert len(builds) == 1
+    assert sorted(results, key=lambda r: isinstance(r, Resource)) == [
+        get_resource_map(schema),
+        get_resource_by_name(schema, "Type0"),
+    ]
+    cache_clear()
+
+
+def test_warm_in_background_concurrent_calls(monkeypatch: pytest.MonkeyPatch):
+    cache_clear()
+    schema = make_schema(10)
+    release = threading.Event()
+    builds = []
+    build_resource_map = resolver._build_resource_map
+
+    def slow_build_resource_map(*args, **kwargs):
+        builds.append(args)
+        release.wait()
+        return build_resource_map(*args, **kwargs)
+
+    monkeypatch.setattr(resolver, "_build_resource_map", slow_build_resource_map)
+
+    num_callers = 8
+    barrier = threading.Barrier(num_callers)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(warm_in_background(schema))
+
+    callers = [threading.Thread(target=call) for _ in range(num_callers)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    # All callers get the thread that is still holding the build open
+    thread = results[0]
+    assert thread is not None
+    assert thread.is_alive()
+    assert all(r is thread for r in results)
+
+    release.set()
+    thread.join()
+    assert len(builds) == 1
+
+    # Once warmed up, no other thread gets started
+    assert warm_in_background(schema) is None
+    assert len(builds) == 1
+    cache_clear()
+
+
+def test_warm_in_background_failure(monkeypatch: pytest.MonkeyPatch):
+    cache_clear()
+    schema = make_schema(5)
+
+    def failing_build_resource_map(*args, **kwargs):
+        raise RuntimeError
+
+    with monkeypatch.context() as m:
+        m.setattr(resolver, "_build_resource_map", failing_build_resource_map)
+        m.setattr(threading, "excepthook", lambda args: None)
+        warm_in_background(schema).join()
+
+    # The resources get resolved again when requested
+    assert "Type0" in get_resource_map(schema)
+    cache_clear()
+
+
+def _count_builds(monkeypatch: pytest.MonkeyPatch) -> List[object]:
+    builds = []
+    build_resource_map = resolver._build_resource_map
+
+    def counted_build_resource_map(*args, **kwargs):
+        builds.append(args)
+        # Give other threads a chance to start another resolution
+        time.sleep(0.01)
+        return build_resource_map(*args, **kwargs)
+
+    monkeypatch.setattr(resolver, "_build_resource_map", counted_build_resource_map)
+    return builds
+
+
+def test_concurrent_resolution(monkeypatch: pytest.MonkeyPatch):
+    cache_clear()
+    schema = make_schema(20)
+    builds = _count_builds(monkeypatch)
+    num_threads = 32
+    barrier = threading.Barrier(num_threads)
+    results = []
+
+    def request(i: int):
+        barrier.wait()
+        if i % 4:
+            results.append(
+                resolver._get_compact_map(schema, resolver._ResolveOptions())
+            )
+        else:
+            get_resource_by_name(schema, f"Type{i % 20}")
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # All threads got the same resources, resolved only once
+    assert len(builds) == 1
+    assert all(r is results[0] for r in results)
+    cache_clear()
+
+
+async def test_concurrent_async_resolution(monkeypatch: pytest.MonkeyPatch):
+    cache_clear()
+    schema = make_schema(20)
+    builds = _count_builds(monkeypatch)
+
+    results = await asyncio.gather(*(aget_resource_map(schema) for _ in range(50)))
+    assert len(builds) == 1
+    assert all(r == results[0] for r in results)
+    assert not resolver._get_schema_cache(schema).async_builds
+
+    # Cancelling a caller does not cancel the resolution for the other ones
+    invalidate(schema)
+    cancelled = asyncio.ensure_future(aget_resource_map(schema))
+    other = asyncio.ensure_future(aget_resource_map(schema))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert (await other) == results[0]
+    assert len(builds) == 2  # noqa: PLR2004
+    cache_clear()
@@ -0,0 +1,95 @@
+import importlib.util
+import pathlib
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+import pytest
+
+from strawberry_resources.resolver import (
+    cache_clear,
+    get_resource_by_name,
+    get_resource_map,
+    resolve_all,
+)
+from strawberry_resources.snapshot import (
+    SnapshotMismatchError,
+    generate_snapshot,
+    load_snapshot,
+)
+
+from .app.schema import schema as django_schema
+from .utils import make_schema
+
+if TYPE_CHECKING:
+    import strawberry
+
+
+def _import_snapshot(path: pathlib.Path, source: str) -> ModuleType:
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [make_schema(20), django_schema],
+    ids=["synthetic", "django"],
+)
+def test_snapshot(
+    resolved: list,
+    tmp_path: pathlib.Path,
+    schema: "strawberry.Schema",
+):
+    expected = {r.name: r for r in resolve_all(schema)}
+    module = _import_snapshot(tmp_path / "snapshot.py", generate_snapshot(schema))
+
+    cache_clear()
+    resolved.clear()
+    load_snapshot(schema, module)
+    assert get_resource_map(schema) == expected
+    assert resolved == []
+    cache_clear()
+
+
+def test_snapshot_shares_nested_fields(tmp_path: pathlib.Path):
+    schema = make_schema(20)
+    module = _import_snapshot(tmp_path / "snapshot.py", generate_snapshot(schema))
+
+    cache_clear()
+    load_snapshot(schema, module)
+    type0 = get_resource_by_name(schema, "Type0")
+    type1 = get_resource_by_name(schema, "Type1")
+    assert type0 is not None
+    assert type1 is not None
+    assert type0.fields[3].fields is type1.fields[2].fields  # type: ignore
+    cache_clear()
+
+
+def test_snapshot_mismatch(tmp_path: pathlib.Path):
+    module = _import_snapshot(
+        tmp_path / "snapshot.py",
+        generate_snapshot(make_schema(5)),
+    )
+
+    with pytest.raises(SnapshotMismatchError):
+        load_snapshot(make_schema(6), module)
+
+
+def test_snapshot_model_changed(
+    tmp_path: pathlib.Path,
+    changed_model,
+):
+    module = _import_snapshot(
+        tmp_path / "snapshot.py",
+        generate_snapshot(django_schema),
+    )
+    load_snapshot(django_schema, module)
+
+    changed_model("name", "verbose_name", "Full name")
+    with pytest.raises(SnapshotMismatchError):
+        load_snapshot(django_schema, module)
+    cache_clear()
@@ -0,0 +1,316 @@
+import pathlib
+from typing import cast
+
+import pytest
+import strawberry
+from typing_extensions import Annotated
+
+from strawberry_resources import resolver
+from strawberry_resources.resolver import (
+    cache_clear,
+    get_resource_by_name,
+    get_resource_map,
+    get_state_fingerprint,
+)
+from strawberry_resources.storage import (
+    DjangoCacheStorage,
+    FileStorage,
+    get_schema_fingerprint,
+    set_storage,
+)
+from strawberry_resources.types import (
+    Field,
+    FieldKind,
+    HiddenField,
+    StringFieldValidation,
+    config,
+)
+
+from .app.schema import schema as django_schema
+from .utils import make_schema
+
+
+@pytest.fixture
+def storage(tmp_path: pathlib.Path):
+    storage = FileStorage(tmp_path / "resources")
+    set_storage(storage)
+    cache_clear()
+    yield storage
+    set_storage(None)
+    cache_clear()
+
+
+def test_file_storage_cold_and_warm_start(storage: FileStorage, resolved: list):
+    schema = make_schema(50, fan_out=3)
+
+    # Cold start, everything gets resolved and stored
+    cold = get_resource_map(schema)
+    assert len(resolved) > 0
+    assert list(storage.path.iterdir()) == [
+        storage.path / f"{get_schema_fingerprint(schema)}.pickle",
+    ]
+
+    # Simulate a new process: the resources should be loaded without resolving
+    cache_clear()
+    resolved.clear()
+    warm = get_resource_map(schema)
+    assert resolved == []
+    assert warm == cold
+
+    cache_clear()
+    assert get_resource_by_name(schema, "Type0") == cold["Type0"]
+    assert resolved == []
+
+
+def test_storage_does_not_fingerprint_fields(
+    storage: FileStorage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    schema = make_schema(10)
+    fingerprinted = []
+    get_fields_fingerprint = resolver._get_fields_fingerprint
+
+    def counted_get_fields_fingerprint(type_def):
+        fingerprinted.append(type_def.name)
+        return get_fields_fingerprint(type_def)
+
+    monkeypatch.setattr(
+        resolver,
+        "_get_fields_fingerprint",
+        counted_get_fields_fingerprint,
+    )
+
+    # The printed schema already covers the fields, neither storing nor loading
+    # the resources needs to describe them again
+    expected = get_resource_map(schema)
+    cache_clear()
+    assert get_resource_map(schema) == expected
+    assert fingerprinted == []
+
+
+def test_file_storage_different_schemas(storage: FileStorage):
+    schema1 = make_schema(5)
+    schema2 = make_schema(6)
+    assert get_schema_fingerprint(schema1) != get_schema_fingerprint(schema2)
+    assert get_schema_fingerprint(schema1) == get_schema_fingerprint(make_schema(5))
+
+    state = get_state_fingerprint(schema1)
+    assert storage.load(get_schema_fingerprint(schema1), state=state) is None
+    get_resource_map(schema1)
+    assert storage.load(get_schema_fingerprint(schema1), state=state) is not None
+    assert storage.load(get_schema_fingerprint(schema2), state=state) is None
+    # Stored for another state
+    assert storage.load(get_schema_fingerprint(schema1)) is None
+
+
+def test_file_storage_corrupted(storage: FileStorage, resolved: list):
+    schema = make_schema(5)
+    expected = get_resource_map(schema)
+    path = storage.path / f"{get_schema_fingerprint(schema)}.pickle"
+    path.write_bytes(b"corrupted")
+
+    cache_clear()
+    resolved.clear()
+    assert get_resource_map(schema) == expected
+    assert len(resolved) > 0
+
+    # The corrupted file should have been replaced by a valid one
+    assert storage.load(
+        get_schema_fingerprint(schema),
+        state=get_state_fingerprint(schema),
+    ) == (resolver._get_compact_map(schema, resolver._ResolveOptions()))
+    assert list(storage.path.glob("*.tmp")) == []
+
+
+def test_file_storage_not_writable(
+    tmp_path: pathlib.Path,
+    resolved: list,
+    caplog: pytest.LogCaptureFixture,
+):
+    # The storage directory cannot be created where a file exists
+    path = tmp_path / "resources"
+    path.write_bytes(b"")
+    set_storage(FileStorage(path))
+    cache_clear()
+    try:
+        schema = make_schema(5)
+        resource_map = get_resource_map(schema)
+        assert len(resolved) > 0
+        assert "Could not store the resources" in caplog.text
+
+        # The resources are still cached
+        resolved.clear()
+        assert get_resource_map(schema) is resource_map
+        assert resolved == []
+    finally:
+        set_storage(None)
+        cache_clear()
+
+
+def test_storage_save_failure(
+    storage: FileStorage,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+):
+    def save(*args, **kwargs):
+        raise RuntimeError("storage is down")
+
+    monkeypatch.setattr(storage, "save", save)
+    schema = make_schema(5)
+    resource_map = get_resource_map(schema)
+    assert "storage is down" in caplog.text
+    assert get_resource_map(schema) is resource_map
+
+
+@pytest.fixture(params=["locmem", "filebased"])
+def django_cache_storage(request, settings, tmp_path: pathlib.Path):
+    backends = {
+        "locmem": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "filebased": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        },
+    }
+    settings.CACHES = {
+        "default": backends["locmem"],
+        "resources": backends[request.param],
+    }
+    storage = DjangoCacheStorage("resources")
+    set_storage(storage)
+    cache_clear()
+    yield storage
+    storage.cache.clear()
+    set_storage(None)
+    cache_clear()
+
+
+def test_django_cache_storage(django_cache_storage: DjangoCacheStorage, resolved: list):
+    schema = make_schema(20)
+    fingerprint = get_schema_fingerprint(schema)
+
+    cold = get_resource_map(schema)
+    assert len(resolved) > 0
+    assert django_cache_storage.cache.get(f"strawberry_resources:{fingerprint}")
+
+    # Simulate another worker sharing the same cache
+    cache_clear()
+    resolved.clear()
+    assert get_resource_map(schema) == cold
+    assert resolved == []
+
+
+def test_django_cache_storage_save_failure(
+    django_cache_storage: DjangoCacheStorage,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+):
+    def set(*args, **kwargs):  # noqa: A001
+        raise ValueError("value too large")
+
+    monkeypatch.setattr(django_cache_storage.cache, "set", set)
+    schema = make_schema(5)
+    resource_map = get_resource_map(schema)
+    assert "Could not store the resources in the 'resources' cache" in caplog.text
+    assert get_resource_map(schema) is resource_map
+    assert django_cache_storage.load(get_schema_fingerprint(schema)) is None
+
+
+def test_django_cache_storage_mismatch(
+    django_cache_storage: DjangoCacheStorage,
+    resolved: list,
+):
+    schema = make_schema(5)
+    fingerprint = get_schema_fingerprint(schema)
+    state = get_state_fingerprint(schema)
+    key = f"strawberry_resources:{fingerprint}"
+    expected = get_resource_map(schema)
+
+    stored = django_cache_storage.cache.get(key)
+    for data in [
+        {**stored, "version": stored["version"] - 1},
+        {**stored, "fingerprint": "other"},
+        {**stored, "state": "other"},
+        "corrupted",
+    ]:
+        django_cache_storage.cache.set(key, data)
+        assert django_cache_storage.load(fingerprint, state=state) is None
+
+        # Resolved locally and stored again
+        cache_clear()
+        resolved.clear()
+        assert get_resource_map(schema) == expected
+        assert len(resolved) > 0
+        assert django_cache_storage.load(fingerprint, state=state) is not None
+
+
+def test_storage_model_changed(
+    storage: FileStorage,
+    resolved: list,
+    changed_model,
+):
+    def name_max_length() -> int:
+        field = get_resource_map(django_schema)["PersonType"].fields[1]
+        assert isinstance(field, Field)
+        assert isinstance(field.validation, StringFieldValidation)
+        return cast(int, field.validation.max_length)
+
+    state = get_state_fingerprint(django_schema)
+    assert state is not None
+    assert name_max_length() == 255  # noqa: PLR2004
+
+    # The stored resources are rejected once the model changes
+    changed_model("name", "max_length", 100)
+    assert get_state_fingerprint(django_schema) != state
+    cache_clear()
+    resolved.clear()
+    assert name_max_length() == 100  # noqa: PLR2004
+    assert len(resolved) > 0
+
+    # And stored again for the new state
+    cache_clear()
+    resolved.clear()
+    assert name_max_length() == 100  # noqa: PLR2004
+    assert resolved == []
+
+
+@pytest.mark.parametrize(
+    "extras",
+    [
+        (config(label="Full name"),),
+        (config(kind=FieldKind.MULTILINE),),
+        (HiddenField(),),
+    ],
+)
+def test_storage_type_options_changed(
+    storage: FileStorage,
+    resolved: list,
+    extras: tuple,
+):
+    def make_item_schema(*extras) -> strawberry.Schema:
+        annotation = Annotated[(str, config(label="Name"), *extras)]  # type: ignore
+
+        @strawberry.type
+        class Item:
+            name: annotation  # type: ignore
+
+        @strawberry.type
+        class Query:
+            item: Item
+
+        return strawberry.Schema(query=Query)
+
+    schema = make_item_schema()
+    # The annotated options do not change the printed schema
+    changed_schema = make_item_schema(*extras)
+    assert get_schema_fingerprint(changed_schema) == get_schema_fingerprint(schema)
+    assert get_state_fingerprint(make_item_schema()) == get_state_fingerprint(schema)
+    assert get_state_fingerprint(changed_schema) != get_state_fingerprint(schema)
+
+    get_resource_map(schema)
+    cache_clear()
+    resolved.clear()
+    resource_map = get_resource_map(changed_schema)
+    assert ("Item", 0) in resolved
+    assert list(resource_map.values()) == list(resolver.resolve_all(changed_schema))
@@ -1,3 +1,13 @@
+import enum
+import itertools
+import sys
+import types
+from typing import Any, Dict, Optional
+
+import strawberry
+
+_schema_counter = itertools.count()
+
 resource_query = """\
 fragment resourceFieldFrag on Field {
   __typename
@@ -93,3 +103,62 @@ query Resource($name: String!) {
   }
 }
 """
+
+
+def make_schema(
+    num_types: int,
+    *,
+    fan_out: int = 2,
+    num_fields: int = 2,
+    enum_size: int = 0,
+    cycles: bool = True,
+    extra_fields: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> strawberry.Schema:
+    """Generate a schema with `num_types` cross-linked types.
+
+    Each type contains `num_fields` scalar fields and references the next
+    `fan_out` types (wrapping around when `cycles` is set, so that the resulting
+    graph has cycles). When `enum_size` is given, each type also gets a field
+    using an enum with that many values, shared by all types.
+    `extra_fields` can be used to add more fields to specific types.
+    """
+    module_name = f"tests._synthetic_{next(_schema_counter)}"
+    module = types.ModuleType(module_name)
+    sys.modules[module_name] = module
+
+    enum_type = (
+        strawberry.enum(
+            enum.Enum(  # type: ignore
+                f"SyntheticEnum{module_name.rsplit('_', 1)[-1]}",
+                {f"VALUE{i}": f"value{i}" for i in range(enum_size)},
+            ),
+        )
+        if enum_size
+        else None
+    )
+
+    names = [f"Type{i}" for i in range(num_types)]
+    for i, name in enumerate(names):
+        annotations: Dict[str, Any] = {f"field{j}": str for j in range(num_fields)}
+        for j in range(1, fan_out + 1):
+            if cycles or i + j < num_types:
+                annotations[f"link{j}"] = names[(i + j) % num_types]
+        if enum_type is not None:
+            annotations["choice"] = enum_type
+        if extra_fields is not None:
+            annotations.update(extra_fields.get(name, {}))
+
+        cls = type(
+            name, (), {"__annotations__": annotations, "__module__": module_name}
+        )
+        setattr(module, name, strawberry.type(cls))
+
+    query = type(
+        "Query",
+        (),
+        {
+            "__annotations__": {n.lower(): getattr(module, n) for n in names},
+            "__module__": module_name,
+        },
+    )
+    return strawberry.Schema(query=strawberry.type(query))